@@ -1,21 +1,53 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flasgger import Swagger
 from app.config import Config
+from app.tenancy import TenantSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': TenantSession})
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    from app import database, tenancy
+    database.init_app(app)
+    tenancy.init_app(app)
     db.init_app(app)
-    migrate.init_app(app, db)
-    Swagger(app)
+
+    # Docs and migration tooling are only imported when enabled
+    if app.config['MIGRATIONS_ENABLED']:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    if app.config['DOCS_ENABLED']:
+        from app import docs
+        docs.init_app(app)
+
+    from app.cache import response_cache
+    response_cache.init_app(app)
+
+    from app.feed import change_feed
+    change_feed.init_app(app)
+
+    if app.config['INSTRUMENTATION_ENABLED']:
+        from app import instrumentation
+        instrumentation.init_app(app)
 
     from app.routes import api_bp
     app.register_blueprint(api_bp)
 
+    from app.scheduler import CheckScheduler
+    scheduler = CheckScheduler(app)
+    if app.config['CHECK_SCHEDULER_ENABLED']:
+        # Started with the first request so CLI commands (flask db ...) never scan
+        app.before_request(scheduler.start)
+
+    from app.delivery import deliver_notifications
+    app.cli.add_command(deliver_notifications)
+
+    from app.stats import rebuild_stats
+    app.cli.add_command(rebuild_stats)
+
+    from app.retention import apply_retention_command
+    app.cli.add_command(apply_retention_command)
+
     return app
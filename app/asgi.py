@@ -0,0 +1,186 @@
+import re
+from urllib.parse import parse_qsl
+from sqlalchemy import event, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.datastructures import MultiDict
+from app import create_app, database, db
+from app.cache import asset_key, asset_list_key, response_cache
+from app.models import Asset, Notification, Violation
+from app.pagination import apply_filters, parse_page_args
+from app.response_model import error_response, paginated_response, success_response
+from app.routes import ASSET_FILTERS, NOTIFICATION_FILTERS, VIOLATION_FILTERS
+from app.serializers import ASSET_COLUMNS, NOTIFICATION_COLUMNS, VIOLATION_COLUMNS, RowSerializer, dumps
+from app.tenancy import current_tenant, parse_tenant, tenant_scope
+
+# Sync driver -> async driver used for the same database
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+def async_url(url):
+    """The async-driver equivalent of a database URL"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver known for {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+class AsyncReadApp:
+    """ASGI application serving the hot read endpoints from an async engine.
+
+    GET /assets, /assets/<id>, /notifications and /violations are answered
+    by coroutines, so a request waiting on the database holds no thread and
+    one worker serves many polling clients. They produce the same envelope,
+    filters, keyset pages and cached ETags as the Flask resources. Every
+    other request, and every request of a tenant routed to a database of its
+    own, is handed to the Flask app through a WSGI adapter.
+    """
+
+    def __init__(self, flask_app):
+        try:
+            from asgiref.wsgi import WsgiToAsgi
+            from sqlalchemy.ext.asyncio import create_async_engine
+        except ImportError:
+            raise RuntimeError("ASGI mode requires the asgiref and greenlet packages")
+
+        self.flask_app = flask_app
+        with flask_app.app_context():
+            url = db.engine.url
+        self.engine = create_async_engine(async_url(url), **flask_app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine.sync_engine, 'connect', lambda connection, record: database.apply_sqlite_pragmas(connection))
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.routes = [
+            (re.compile(r'/assets'), self.asset_list),
+            (re.compile(r'/assets/(\d+)'), self.asset_detail),
+            (re.compile(r'/notifications'), self.notification_list),
+            (re.compile(r'/violations'), self.violation_list),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+            for pattern, handler in self.routes:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    return await self.handle(scope, receive, send, handler, match.groups())
+        await self.wsgi(scope, receive, send)
+
+    async def handle(self, scope, receive, send, handler, arguments):
+        config = self.flask_app.config
+        try:
+            tenant = parse_tenant(_header(scope, config['TENANT_HEADER'].lower().encode('latin-1')))
+        except ValueError:
+            # Flask answers with the same 400
+            tenant = None
+        if tenant is None or tenant in config['TENANT_DATABASES']:
+            return await self.wsgi(scope, receive, send)
+        with self.flask_app.app_context(), tenant_scope(tenant):
+            return await handler(scope, send, *arguments)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def asset_list(self, scope, send):
+        args = _query_args(scope)
+        return await self.respond(scope, send, asset_list_key(args), lambda: self.list_page(Asset, ASSET_COLUMNS, ASSET_FILTERS, args))
+
+    async def asset_detail(self, scope, send, asset_id):
+        asset_id = int(asset_id)
+
+        async def build():
+            try:
+                async with self.engine.connect() as connection:
+                    row = (await connection.execute(select(*ASSET_COLUMNS).where(Asset.id == asset_id, Asset.tenant == current_tenant()))).first()
+            except SQLAlchemyError as e:
+                return error_response("Database error", 500, {"details": str(e)})
+            if row is None:
+                return error_response("Asset not found", 404)
+            return success_response(RowSerializer(ASSET_COLUMNS)(row))
+
+        return await self.respond(scope, send, asset_key(asset_id), build)
+
+    async def notification_list(self, scope, send):
+        payload, status = await self.list_page(Notification, NOTIFICATION_COLUMNS, NOTIFICATION_FILTERS, _query_args(scope))
+        await _send_json(scope, send, status, dumps(payload))
+
+    async def violation_list(self, scope, send):
+        payload, status = await self.list_page(Violation, VIOLATION_COLUMNS, VIOLATION_FILTERS, _query_args(scope))
+        await _send_json(scope, send, status, dumps(payload))
+
+    async def list_page(self, model, columns, filters, args):
+        """The async twin of routes.list_page"""
+        try:
+            cursor, limit = parse_page_args(args)
+            stmt = apply_filters(select(*columns).where(model.tenant == current_tenant()), args, filters)
+        except ValueError as e:
+            return error_response("Invalid query parameters", 400, {"details": str(e)})
+
+        if cursor is not None:
+            stmt = stmt.where(model.id > cursor)
+        try:
+            async with self.engine.connect() as connection:
+                rows = (await connection.execute(stmt.order_by(model.id).limit(limit + 1))).all()
+        except SQLAlchemyError as e:
+            return error_response("Database error", 500, {"details": str(e)})
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1].id
+        return paginated_response(RowSerializer(columns).many(rows), next_cursor)
+
+    async def respond(self, scope, send, key, build):
+        """ResponseCache.respond for coroutines: cached bodies, ETags and 304s"""
+        if_none_match = _header(scope, b'if-none-match')
+        cached = response_cache.lookup(key)
+        if cached is None:
+            payload, status = await build()
+            body = dumps(payload)
+            body = body.encode() if isinstance(body, str) else body
+            if status != 200:
+                return await _send_json(scope, send, status, body)
+            etag = response_cache.store(key, body)
+        else:
+            etag, body = cached
+
+        quoted = f'"{etag}"'
+        if if_none_match and quoted in (tag.strip() for tag in if_none_match.split(',')):
+            return await _send_json(scope, send, 304, b"", etag=quoted)
+        await _send_json(scope, send, 200, body, etag=quoted)
+
+def create_asgi_app():
+    """Build the Flask app and wrap it for an ASGI server, e.g.
+
+        uvicorn --factory app.asgi:create_asgi_app
+    """
+    return AsyncReadApp(create_app())
+
+def _query_args(scope):
+    return MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+
+def _header(scope, name):
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+async def _send_json(scope, send, status, body, etag=None):
+    body = body.encode() if isinstance(body, str) else body
+    headers = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+    if etag:
+        headers.append((b'etag', etag.encode()))
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': b"" if scope['method'] == 'HEAD' else body})
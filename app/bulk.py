@@ -0,0 +1,238 @@
+import json
+from datetime import datetime
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.cache import invalidate_assets
+from app.deadlines import deadline_queue
+from app.models import Asset, Notification, Violation
+from app.schedules import advance_schedules
+from app.schemas import asset_schema, assets_schema
+from app.tenancy import current_tenant
+from app.utils import resolve_violations
+
+ASSET_TIME_FIELDS = ('service_time', 'expiration_time', 'last_serviced')
+ASSET_SCHEDULE_FIELDS = ('service_interval_minutes', 'service_cron')
+
+def parse_bulk_body(request):
+    """Read a bulk payload sent as a JSON array or as NDJSON.
+
+    Returns the list of records; NDJSON lines that are not valid JSON are kept
+    as exceptions so they can be reported against their row index.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        records = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                records.append(e)
+        return records
+
+    records = request.get_json(silent=True)
+    if not isinstance(records, list):
+        raise ValueError("Body must be a JSON array or NDJSON")
+    return records
+
+def ingest_assets(records, batch_size):
+    """Upsert the current tenant's assets by name, validating and committing one chunk at a time.
+
+    Each chunk costs one validation pass, one `IN` lookup for existing names,
+    one bulk insert, one bulk update, one bulk advance of recurring schedules
+    and one commit. A failing chunk is rolled
+    back on its own and reported against each of its rows.
+    """
+    result = {"created": 0, "updated": 0, "errors": []}
+    for start in range(0, len(records), batch_size):
+        _ingest_chunk(records[start:start + batch_size], start, result)
+    return result
+
+def parse_selection(body, filters, apply_filters):
+    """Build a SELECT of Asset ids from a bulk body's `ids` list or `filter` object.
+
+    `filters` and `apply_filters` are the list endpoint's, so a bulk filter
+    accepts the same keys as GET /assets. Only the current tenant's assets
+    are selected. Raises ValueError on a bad body.
+    """
+    if not isinstance(body, dict) or ('ids' not in body and 'filter' not in body):
+        raise ValueError("Body must contain 'ids' or 'filter'")
+
+    selection = select(Asset.id).where(Asset.tenant == current_tenant())
+    if 'ids' in body:
+        ids = body['ids']
+        if not isinstance(ids, list) or not all(isinstance(asset_id, int) for asset_id in ids):
+            raise ValueError("'ids' must be a list of integers")
+        selection = selection.where(Asset.id.in_(ids))
+    if 'filter' in body:
+        if not isinstance(body['filter'], dict):
+            raise ValueError("'filter' must be an object")
+        unknown = set(body['filter']) - set(filters)
+        if unknown:
+            raise ValueError(f"Unknown filters: {', '.join(sorted(unknown))}")
+        selection = apply_filters(selection, body['filter'], filters)
+    return selection
+
+def parse_patch_values(changes):
+    """Validate the `set` object of a bulk PATCH into column values"""
+    if not isinstance(changes, dict) or not changes:
+        raise ValueError("'set' must be a non-empty object")
+    if 'name' in changes:
+        raise ValueError("Names are unique and cannot be bulk updated")
+
+    errors = asset_schema.validate(changes, partial=True)
+    if errors:
+        raise ValueError(errors)
+    values = _asset_values(changes)
+    if values.get('service_interval_minutes'):
+        values['service_cron'] = None
+    elif values.get('service_cron'):
+        values['service_interval_minutes'] = None
+    return values
+
+def patch_assets(selection, values, batch_size, atomic=True):
+    """Apply the same column values to every selected asset.
+
+    Ids are read by keyset `batch_size` at a time and each chunk is changed
+    with one UPDATE; open violations of the chunk are resolved and recurring
+    schedules advanced with one statement each. With `atomic` everything
+    commits together, otherwise each chunk commits on its own so very large
+    selections never hold one long transaction.
+    """
+    result = {"updated": 0, "violations_resolved": 0}
+    now = datetime.utcnow()
+    retime = any(field in values for field in ASSET_TIME_FIELDS + ASSET_SCHEDULE_FIELDS)
+
+    def apply(ids):
+        chunk = [Asset.id.in_(ids)]
+        result["updated"] += db.session.execute(
+            update(Asset).where(*chunk).values(**values).execution_options(synchronize_session=False)
+        ).rowcount
+        if retime:
+            advance_schedules(db.session, now, chunk)
+            result["violations_resolved"] += resolve_violations(db.session, now, chunk)
+            deadline_queue.track_selected(db.session, chunk)
+
+    _each_chunk(selection, batch_size, atomic, apply)
+    return result
+
+def delete_assets(selection, batch_size, atomic=True):
+    """Delete the selected assets together with their notifications and violations.
+
+    Chunks and transactions work as in `patch_assets`; each chunk costs one
+    DELETE per table.
+    """
+    result = {"assets": 0, "notifications": 0, "violations": 0}
+
+    def apply(ids):
+        for key, count in delete_asset_rows(db.session, ids).items():
+            result[key] += count
+
+    _each_chunk(selection, batch_size, atomic, apply)
+    return result
+
+def delete_asset_rows(session, ids):
+    """Delete assets by id and the rows that reference them; the caller commits"""
+    counts = {}
+    for key, model in (("notifications", Notification), ("violations", Violation)):
+        counts[key] = session.execute(
+            delete(model).where(model.asset_id.in_(ids)).execution_options(synchronize_session=False)
+        ).rowcount
+    counts["assets"] = session.execute(
+        delete(Asset).where(Asset.id.in_(ids)).execution_options(synchronize_session=False)
+    ).rowcount
+    return counts
+
+def _each_chunk(selection, batch_size, atomic, apply):
+    stmt = selection.order_by(Asset.id).limit(batch_size)
+    touched = []
+    after_id = 0
+    try:
+        while True:
+            ids = db.session.execute(stmt.where(Asset.id > after_id)).scalars().all()
+            if not ids:
+                break
+            apply(ids)
+            after_id = ids[-1]
+            if atomic:
+                touched.extend(ids)
+            else:
+                db.session.commit()
+                invalidate_assets(ids)
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+    invalidate_assets(touched)
+
+def _ingest_chunk(chunk, offset, result):
+    rows = {}
+    for index, record, errors in _validate_chunk(chunk, offset):
+        if errors:
+            result["errors"].append({"index": index, "errors": errors})
+        else:
+            # Later rows with the same name win, as if they were sent one by one
+            rows[record['name']] = (index, record)
+
+    if not rows:
+        return
+
+    tenant = current_tenant()
+    try:
+        existing = dict(db.session.execute(
+            select(Asset.name, Asset.id).where(Asset.tenant == tenant, Asset.name.in_(rows))
+        ).all())
+        inserts = [dict(record, tenant=tenant) for name, (_, record) in rows.items() if name not in existing]
+        updates = [dict(record, id=existing[name]) for name, (_, record) in rows.items() if name in existing]
+
+        if inserts:
+            db.session.execute(insert(Asset), inserts)
+        if updates:
+            db.session.execute(update(Asset), updates)
+        written = [Asset.tenant == tenant, Asset.name.in_(rows)]
+        advance_schedules(db.session, datetime.utcnow(), written)
+        deadline_queue.track_selected(db.session, written)
+        db.session.commit()
+        invalidate_assets(existing.values())
+    except (SQLAlchemyError, ValueError) as e:
+        # ValueError: a stored cron rule that never fires cannot be advanced
+        db.session.rollback()
+        for index, _ in rows.values():
+            result["errors"].append({"index": index, "errors": {"details": str(e)}})
+        return
+
+    result["created"] += len(inserts)
+    result["updated"] += len(updates)
+
+def _validate_chunk(chunk, offset):
+    valid = [record for record in chunk if isinstance(record, dict)]
+    schema_errors = assets_schema.validate(valid)
+
+    position = 0
+    for index, record in enumerate(chunk, offset):
+        if not isinstance(record, dict):
+            message = str(record) if isinstance(record, Exception) else "Invalid input type."
+            yield index, None, {"_schema": [message]}
+            continue
+
+        errors = schema_errors.get(position)
+        position += 1
+        if errors:
+            yield index, None, errors
+            continue
+
+        try:
+            yield index, _asset_values(record), None
+        except (TypeError, ValueError) as e:
+            yield index, None, {"details": f"Invalid date format: {e}"}
+
+def _asset_values(record):
+    values = {'name': record['name']} if 'name' in record else {}
+    for field in ASSET_TIME_FIELDS:
+        if field in record:
+            values[field] = datetime.fromisoformat(record[field]) if record[field] is not None else None
+    for field in ASSET_SCHEDULE_FIELDS:
+        if field in record:
+            values[field] = record[field]
+    return values
@@ -0,0 +1,198 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from urllib.parse import urlencode
+from flask import make_response, request
+from app.serializers import output_json
+from app.tenancy import current_tenant
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisCache:
+    """Cache backed by Redis or any client exposing get/set/delete"""
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND = 'redis' requires the redis package")
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, value, ttl):
+        self.client.set(key, value, ex=max(int(ttl), 1))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*keys)
+
+    def __len__(self):
+        return self.client.dbsize()
+
+class NullCache:
+    """Backend that never stores anything, for disabling the cache"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def __len__(self):
+        return 0
+
+class ResponseCache:
+    """Read-through cache of encoded JSON responses with ETag support.
+
+    Entries are stored as `etag + b"\\n" + body`. List pages are keyed by a
+    generation token as well as their query string, so bumping the token
+    invalidates every cached page at once.
+    """
+
+    def __init__(self, app=None):
+        self.backend = NullCache()
+        self.ttl = 30
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        if config['CACHE_BACKEND'] == 'memory':
+            self.backend = MemoryCache(config['CACHE_MAX_ENTRIES'])
+        elif config['CACHE_BACKEND'] == 'redis':
+            self.backend = RedisCache.from_url(config['CACHE_REDIS_URL'])
+        else:
+            self.backend = NullCache()
+        self.ttl = config['CACHE_TTL_SECONDS']
+        self.hits = 0
+        self.misses = 0
+        app.extensions['response_cache'] = self
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def generation(self, name):
+        key = f"generation:{name}"
+        token = self.backend.get(key)
+        if token is None:
+            token = uuid.uuid4().hex.encode()
+            self.backend.set(key, token, self.ttl)
+        return token.decode() if isinstance(token, bytes) else token
+
+    def bump(self, name):
+        self.backend.delete(f"generation:{name}")
+
+    def respond(self, key, build, ttl=None):
+        """Serve the response for `key`, calling `build()` on a miss.
+
+        `build` returns a `(payload, status)` tuple like the resources do; only
+        200 responses are cached, for `ttl` seconds if given instead of the
+        configured TTL. A matching If-None-Match gets a 304.
+        """
+        cached = self.lookup(key)
+        if cached is not None:
+            etag, body = cached
+            response = make_response(body, 200, {'Content-Type': 'application/json'})
+            response.set_etag(etag)
+            return response.make_conditional(request)
+
+        payload, status = build()
+        response = output_json(payload, status)
+        if status == 200:
+            response.set_etag(self.store(key, response.get_data(), ttl))
+            response = response.make_conditional(request)
+        return response
+
+    def lookup(self, key):
+        """Return the cached `(etag, body)` for `key`, or None on a miss"""
+        cached = self.backend.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        etag, body = cached.split(b"\n", 1)
+        return etag.decode(), body
+
+    def store(self, key, body, ttl=None):
+        """Cache an encoded 200 response body and return its ETag"""
+        etag = hashlib.sha1(body).hexdigest()
+        self.backend.set(key, etag.encode() + b"\n" + body, ttl or self.ttl)
+        return etag
+
+response_cache = ResponseCache()
+
+# Keys below belong to the current tenant, so tenants never see each other's
+# cached responses and a write only invalidates its own tenant's pages
+
+def asset_key(asset_id, tenant=None):
+    return f"asset:{tenant or current_tenant()}:{asset_id}"
+
+def asset_list_key(args):
+    tenant = current_tenant()
+    query = urlencode(sorted(args.items(multi=True)))
+    return f"assets:{tenant}:{response_cache.generation(f'assets:{tenant}')}:{query}"
+
+def asset_due_key(args):
+    tenant = current_tenant()
+    query = urlencode(sorted(args.items(multi=True)))
+    return f"assets-due:{tenant}:{response_cache.generation(f'assets:{tenant}')}:{query}"
+
+def invalidate_assets(asset_ids=(), tenant=None):
+    """Drop cached details for the given assets and every cached asset list page.
+
+    Defaults to the current tenant's assets.
+    """
+    tenant = tenant or current_tenant()
+    response_cache.backend.delete(*(asset_key(asset_id, tenant) for asset_id in asset_ids))
+    response_cache.bump(f'assets:{tenant}')
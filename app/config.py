@@ -1,11 +1,128 @@
 import os
 from dotenv import load_dotenv
+from app.tenancy import tenant_databases
 
 load_dotenv()
 
+def engine_options(uri):
+    """SQLAlchemy engine options for the configured database.
+
+    Server databases get an explicitly sized pool; SQLite files get a driver
+    level busy timeout matching the busy_timeout pragma.
+    """
+    options = {
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+    }
+    if not uri or uri.startswith('sqlite'):
+        if uri and ':memory:' not in uri and uri not in ('sqlite://', 'sqlite:///'):
+            options['connect_args'] = {'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)) / 1000}
+        return options
+
+    options.update({
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+    })
+    return options
+
+def retention_policies(value):
+    """Parse "notification=90,violation.expiration=730" into {table: {event_type or '*': days}}"""
+    policies = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        key, days = item.split('=')
+        table, _, event_type = key.strip().partition('.')
+        if table not in ('notification', 'violation'):
+            raise ValueError(f"Unknown retention table: {table}")
+        policies.setdefault(table, {})[event_type or '*'] = int(days)
+    return policies
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # Set on every new SQLite connection; WAL lets readers run alongside a writer
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 268435456)),
+    }
+    # Requests name their tenant in TENANT_HEADER (default tenant when absent).
+    # Tenants listed in TENANT_DATABASES ("acme=sqlite:///acme.db,...") get a
+    # database of their own; everyone else shares DATABASE_URL.
+    TENANT_HEADER = os.getenv('TENANT_HEADER', 'X-Tenant')
+    TENANT_DATABASES = tenant_databases(os.getenv('TENANT_DATABASES', ''))
+    PAGE_SIZE = int(os.getenv('PAGE_SIZE', 100))
+    MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 1000))
+    BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', 1000))
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    # Notifications are created for deadlines within this many minutes
+    CHECK_UPCOMING_MINUTES = int(os.getenv('CHECK_UPCOMING_MINUTES', 15))
+    # Background scheduler: run checks every CHECK_INTERVAL_SECONDS when enabled.
+    # The lease keeps other nodes out for CHECK_LEASE_SECONDS after a run starts.
+    CHECK_SCHEDULER_ENABLED = os.getenv('CHECK_SCHEDULER_ENABLED', 'false').lower() == 'true'
+    CHECK_INTERVAL_SECONDS = int(os.getenv('CHECK_INTERVAL_SECONDS', 60))
+    CHECK_LEASE_SECONDS = int(os.getenv('CHECK_LEASE_SECONDS', 300))
+    # 'full' scans every interval; 'incremental' fires checks at queued deadlines
+    # and only rescans everything every CHECK_RECONCILE_SECONDS
+    CHECK_MODE = os.getenv('CHECK_MODE', 'full')
+    CHECK_RECONCILE_SECONDS = int(os.getenv('CHECK_RECONCILE_SECONDS', 3600))
+    # Full scans are split by asset id range across this many worker processes
+    CHECK_SHARDS = int(os.getenv('CHECK_SHARDS', 1))
+    # Scheduled runs check each tenant under its own lease, this many at a time
+    CHECK_TENANT_CONCURRENCY = int(os.getenv('CHECK_TENANT_CONCURRENCY', 4))
+    # Notification delivery worker (flask deliver-notifications)
+    DELIVERY_SINK = os.getenv('DELIVERY_SINK', 'file')
+    DELIVERY_FILE_PATH = os.getenv('DELIVERY_FILE_PATH', 'notifications.ndjson')
+    DELIVERY_WEBHOOK_URL = os.getenv('DELIVERY_WEBHOOK_URL')
+    DELIVERY_SMTP_HOST = os.getenv('DELIVERY_SMTP_HOST', 'localhost')
+    DELIVERY_SMTP_PORT = int(os.getenv('DELIVERY_SMTP_PORT', 25))
+    DELIVERY_SMTP_SENDER = os.getenv('DELIVERY_SMTP_SENDER', 'assets@localhost')
+    DELIVERY_SMTP_RECIPIENTS = [r for r in os.getenv('DELIVERY_SMTP_RECIPIENTS', '').split(',') if r]
+    DELIVERY_BATCH_SIZE = int(os.getenv('DELIVERY_BATCH_SIZE', 100))
+    DELIVERY_CONCURRENCY = int(os.getenv('DELIVERY_CONCURRENCY', 4))
+    DELIVERY_QUEUE_SIZE = int(os.getenv('DELIVERY_QUEUE_SIZE', 8))
+    DELIVERY_MAX_ATTEMPTS = int(os.getenv('DELIVERY_MAX_ATTEMPTS', 5))
+    DELIVERY_BACKOFF_SECONDS = int(os.getenv('DELIVERY_BACKOFF_SECONDS', 30))
+    DELIVERY_LEASE_SECONDS = int(os.getenv('DELIVERY_LEASE_SECONDS', 300))
+    DELIVERY_POLL_SECONDS = int(os.getenv('DELIVERY_POLL_SECONDS', 5))
+    # 'json' keeps response bodies byte-identical to Flask-RESTful's encoder;
+    # 'orjson' is faster but uses compact separators
+    FAST_JSON_ENCODER = os.getenv('FAST_JSON_ENCODER', 'json')
+    # Read-through cache for asset detail and list responses: 'memory', 'redis' or 'none'
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', 30))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+    # GET /assets/due results depend on the current time, so they expire sooner
+    DUE_CACHE_TTL_SECONDS = int(os.getenv('DUE_CACHE_TTL_SECONDS', 5))
+    # Change feed behind GET /events and /events/stream. Waiting clients see
+    # commits from other processes within FEED_POLL_SECONDS; each tenant keeps
+    # its newest FEED_KEEP_EVENTS entries.
+    FEED_POLL_SECONDS = float(os.getenv('FEED_POLL_SECONDS', 0.5))
+    FEED_KEEP_EVENTS = int(os.getenv('FEED_KEEP_EVENTS', 100000))
+    FEED_LONG_POLL_SECONDS = int(os.getenv('FEED_LONG_POLL_SECONDS', 25))
+    FEED_HEARTBEAT_SECONDS = int(os.getenv('FEED_HEARTBEAT_SECONDS', 15))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # Rows older than their policy's days are archived to RETENTION_ARCHIVE_DIR
+    # and deleted by `flask apply-retention`; tables or event types without a
+    # policy (or with 0 days) are kept forever
+    RETENTION_POLICIES = retention_policies(os.getenv('RETENTION_POLICIES', 'notification=90,violation=365'))
+    RETENTION_ARCHIVE_DIR = os.getenv('RETENTION_ARCHIVE_DIR', 'archive')
+    RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', 1000))
+    RETENTION_PAUSE_SECONDS = float(os.getenv('RETENTION_PAUSE_SECONDS', 0))
+    # Opt-in request/SQL instrumentation: /metrics and Server-Timing headers.
+    # PROFILE_SAMPLE_RATE of requests run under cProfile; the PROFILE_KEEP
+    # slowest are dumped to PROFILE_DIR.
+    INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'false').lower() == 'true'
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+    PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', 20))
+    # Workers and CLI jobs can skip importing flasgger / Flask-Migrate entirely.
+    # The generated OpenAPI spec is cached in DOCS_SPEC_CACHE ('' disables).
+    DOCS_ENABLED = os.getenv('DOCS_ENABLED', 'true').lower() == 'true'
+    DOCS_SPEC_CACHE = os.getenv('DOCS_SPEC_CACHE', '.cache/apispec.json')
+    MIGRATIONS_ENABLED = os.getenv('MIGRATIONS_ENABLED', 'true').lower() == 'true'
     SWAGGER = {
         'title': 'Asset Manager API',
         'uiversion': 3,
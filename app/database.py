@@ -0,0 +1,26 @@
+import sqlite3
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_sqlite_pragmas = {}
+
+def init_app(app):
+    """Apply SQLITE_PRAGMAS to every new SQLite connection"""
+    use_sqlite_pragmas(app.config['SQLITE_PRAGMAS'])
+
+def use_sqlite_pragmas(pragmas):
+    _sqlite_pragmas.clear()
+    _sqlite_pragmas.update(pragmas)
+    if not event.contains(Engine, 'connect', _set_sqlite_pragmas):
+        event.listen(Engine, 'connect', _set_sqlite_pragmas)
+
+def apply_sqlite_pragmas(dbapi_connection):
+    """Set the configured pragmas on one DBAPI connection, e.g. an aiosqlite adapter"""
+    cursor = dbapi_connection.cursor()
+    for name, value in _sqlite_pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        apply_sqlite_pragmas(dbapi_connection)
@@ -0,0 +1,141 @@
+import heapq
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, or_, select
+from app.models import Asset
+from app.tenancy import DEFAULT_TENANT, tenant_scope
+
+# Violation triggers fire just after the deadline, since a deadline is only
+# missed once `now` is strictly past it
+VIOLATION_DELAY = timedelta(microseconds=1)
+
+class DeadlineQueue:
+    """Min-heap of the moments at which an asset's check result can change.
+
+    Each deadline contributes two triggers: when it enters the notification
+    window and when it is missed. Only triggers up to the reconcile horizon are
+    held, so the heap stays proportional to the deadlines falling due before
+    the next full reconcile rather than to the size of the Asset table.
+
+    Entries are keyed by (tenant, asset id), since ids are only unique within
+    a tenant's database. Entries are never removed when an asset changes; a stale trigger only
+    causes a redundant (and idempotent) check of that asset. ORM writes are
+    tracked by mapper hooks; bulk statements must call `track_many` or
+    `track_selected` themselves.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._lock = threading.Lock()
+        self.changed = threading.Event()
+        self.window = timedelta(minutes=15)
+        self.horizon = timedelta(hours=1)
+        self.horizon_end = None
+
+    def init_app(self, app):
+        self.window = timedelta(minutes=app.config['CHECK_UPCOMING_MINUTES'])
+        self.horizon = timedelta(seconds=app.config['CHECK_RECONCILE_SECONDS'])
+        app.extensions['deadline_queue'] = self
+        for identifier in ('after_insert', 'after_update'):
+            if not event.contains(Asset, identifier, _track_asset):
+                event.listen(Asset, identifier, _track_asset)
+
+    def rebuild(self, session, now):
+        """Reload the triggers due before the next reconcile from every tenant database"""
+        horizon_end = now + self.horizon
+        upper = horizon_end + self.window
+        stmt = select(Asset.tenant, Asset.id, Asset.service_time, Asset.expiration_time).where(or_(
+            Asset.service_time.between(now, upper),
+            Asset.expiration_time.between(now, upper)
+        ))
+
+        heap = []
+        routed = current_app.config['TENANT_DATABASES']
+        # One read of the shared database, then one per routed tenant
+        scopes = [(DEFAULT_TENANT, Asset.tenant.not_in(list(routed)))]
+        scopes.extend((tenant, Asset.tenant == tenant) for tenant in routed)
+        for scope, criteria in scopes:
+            with tenant_scope(scope):
+                rows = session.execute(stmt.where(criteria)).all()
+            for tenant, asset_id, *deadlines in rows:
+                for deadline in deadlines:
+                    # Missed deadlines were just handled by the full reconcile
+                    if deadline is not None and deadline >= now:
+                        heap.extend((when, tenant, asset_id) for when in self._triggers(deadline, now, horizon_end))
+        heapq.heapify(heap)
+
+        with self._lock:
+            self._heap = heap
+            self.horizon_end = horizon_end
+        self.changed.set()
+
+    def track(self, tenant, asset_id, deadlines, now=None):
+        """Queue the triggers for an asset whose deadlines were just written"""
+        self.track_many([(tenant, asset_id, deadlines)], now)
+
+    def track_many(self, rows, now=None):
+        """Queue the triggers for `(tenant, asset_id, deadlines)` rows that were just written"""
+        if self.horizon_end is None:
+            return
+
+        now = now or datetime.utcnow()
+        with self._lock:
+            for tenant, asset_id, deadlines in rows:
+                for deadline in deadlines:
+                    for when in self._triggers(deadline, now, self.horizon_end):
+                        heapq.heappush(self._heap, (when, tenant, asset_id))
+        self.changed.set()
+
+    def track_selected(self, session, criteria):
+        """Queue the triggers of the assets matching `criteria` after a bulk write.
+
+        Bulk INSERT and UPDATE statements bypass the ORM hooks, so the written
+        rows are read back; only deadlines up to the horizon are fetched.
+        """
+        if self.horizon_end is None:
+            return
+
+        upper = self.horizon_end + self.window
+        rows = session.execute(
+            select(Asset.tenant, Asset.id, Asset.service_time, Asset.expiration_time)
+            .where(or_(Asset.service_time <= upper, Asset.expiration_time <= upper), *criteria)
+        )
+        self.track_many((tenant, asset_id, deadlines) for tenant, asset_id, *deadlines in rows)
+
+    def defer(self, tenant, asset_ids, when):
+        """Queue the assets to be checked again at `when`"""
+        with self._lock:
+            for asset_id in asset_ids:
+                heapq.heappush(self._heap, (when, tenant, asset_id))
+        self.changed.set()
+
+    def pop_due(self, now):
+        """Remove the triggers at or before `now`, returning {tenant: asset ids}"""
+        due = {}
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, tenant, asset_id = heapq.heappop(self._heap)
+                due.setdefault(tenant, set()).add(asset_id)
+        return due
+
+    def next_due(self):
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _triggers(self, deadline, now, horizon_end):
+        if deadline is None:
+            return []
+        if deadline < now:
+            # Already missed: check right away
+            return [now]
+        triggers = [max(deadline - self.window, now), deadline + VIOLATION_DELAY]
+        return [when for when in triggers if when <= horizon_end]
+
+deadline_queue = DeadlineQueue()
+
+def _track_asset(mapper, connection, target):
+    deadline_queue.track(target.tenant, target.id, (target.service_time, target.expiration_time))
@@ -0,0 +1,288 @@
+import asyncio
+import json
+import smtplib
+import time
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.models import Notification
+from app.tenancy import tenant_scope
+from app.serializers import RowSerializer
+
+OUTBOX_COLUMNS = (
+    Notification.id, Notification.tenant, Notification.asset_id, Notification.message,
+    Notification.event_type, Notification.event_time, Notification.created_at,
+    Notification.delivery_attempts
+)
+
+class StubSink:
+    """Keeps delivered batches in memory; fails the next `fail_batches` sends"""
+
+    def __init__(self, fail_batches=0):
+        self.delivered = []
+        self.fail_batches = fail_batches
+
+    async def send(self, batch):
+        if self.fail_batches:
+            self.fail_batches -= 1
+            raise RuntimeError("stub sink failure")
+        self.delivered.extend(batch)
+
+class FileSink:
+    """Appends each notification as one NDJSON line"""
+
+    def __init__(self, path):
+        self.path = path
+
+    async def send(self, batch):
+        lines = "".join(json.dumps(notification) + "\n" for notification in batch)
+        await asyncio.to_thread(self._append, lines)
+
+    def _append(self, lines):
+        with open(self.path, 'a') as handle:
+            handle.write(lines)
+
+class WebhookSink:
+    """POSTs each batch as a JSON array to a URL"""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    async def send(self, batch):
+        await asyncio.to_thread(self._post, json.dumps(batch).encode())
+
+    def _post(self, body):
+        request = urllib.request.Request(
+            self.url, data=body, method='POST', headers={'Content-Type': 'application/json'}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+class SmtpSink:
+    """Sends one email per batch listing its notifications"""
+
+    def __init__(self, host, port, sender, recipients):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+
+    async def send(self, batch):
+        await asyncio.to_thread(self._send, batch)
+
+    def _send(self, batch):
+        message = EmailMessage()
+        message['Subject'] = f"{len(batch)} asset notification(s)"
+        message['From'] = self.sender
+        message['To'] = ", ".join(self.recipients)
+        message.set_content("\n".join(notification['message'] for notification in batch))
+        with smtplib.SMTP(self.host, self.port) as smtp:
+            smtp.send_message(message)
+
+def sink_from_config(config):
+    kind = config['DELIVERY_SINK']
+    if kind == 'file':
+        return FileSink(config['DELIVERY_FILE_PATH'])
+    if kind == 'webhook':
+        return WebhookSink(config['DELIVERY_WEBHOOK_URL'])
+    if kind == 'smtp':
+        return SmtpSink(
+            config['DELIVERY_SMTP_HOST'],
+            config['DELIVERY_SMTP_PORT'],
+            config['DELIVERY_SMTP_SENDER'],
+            config['DELIVERY_SMTP_RECIPIENTS']
+        )
+    if kind == 'stub':
+        return StubSink()
+    raise ValueError(f"Unknown DELIVERY_SINK: {kind}")
+
+class DeliveryWorker:
+    """Drains the notification outbox to a sink with bounded concurrency.
+
+    `run_checks` only inserts `pending` rows, so check latency never depends on
+    delivery. The worker claims due rows in batches into a bounded queue (the
+    reader waits when senders fall behind), `concurrency` tasks send batches,
+    and each row ends up `delivered`, or is retried with exponential backoff
+    until `max_attempts` marks it `failed`. A claimed row is `sending` until
+    `lease_seconds` pass, so concurrent workers never send it twice and rows
+    of a worker that died are picked up again. Database calls run in threads
+    with sessions of their own, off the event loop. Must run inside an app
+    context.
+    """
+
+    def __init__(self, sink, batch_size=100, concurrency=4, max_attempts=5, backoff_seconds=30, queue_size=8,
+                 lease_seconds=300):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.queue_size = queue_size
+        self.lease_seconds = lease_seconds
+        self.stats = {"delivered": 0, "retried": 0, "failed": 0, "seconds": 0.0}
+
+    @classmethod
+    def from_config(cls, config, sink=None):
+        return cls(
+            sink or sink_from_config(config),
+            batch_size=config['DELIVERY_BATCH_SIZE'],
+            concurrency=config['DELIVERY_CONCURRENCY'],
+            max_attempts=config['DELIVERY_MAX_ATTEMPTS'],
+            backoff_seconds=config['DELIVERY_BACKOFF_SECONDS'],
+            queue_size=config['DELIVERY_QUEUE_SIZE'],
+            lease_seconds=config['DELIVERY_LEASE_SECONDS']
+        )
+
+    def rate(self):
+        """Notifications delivered per second over the runs so far"""
+        return self.stats["delivered"] / self.stats["seconds"] if self.stats["seconds"] else 0.0
+
+    def drain(self):
+        """Deliver every row that is due now, then return the stats"""
+        started = time.perf_counter()
+        asyncio.run(self._drain())
+        self.stats["seconds"] += time.perf_counter() - started
+        return self.stats
+
+    async def _drain(self):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        senders = [asyncio.create_task(self._sender(queue)) for _ in range(self.concurrency)]
+
+        try:
+            after_id = 0
+            now = datetime.utcnow()
+            while True:
+                batch = await asyncio.to_thread(self._claim, after_id, now)
+                if not batch:
+                    break
+                after_id = batch[-1]['id']
+                await queue.put(batch)
+        finally:
+            for _ in senders:
+                await queue.put(None)
+            await asyncio.gather(*senders)
+
+    async def _sender(self, queue):
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            try:
+                await self.sink.send([self._public(row) for row in batch])
+            except Exception as e:
+                current_app.logger.warning("Delivery of %d notifications failed: %s", len(batch), e)
+                record = self._record_failure
+            else:
+                record = self._record_success
+            try:
+                counts = await asyncio.to_thread(record, batch)
+            except SQLAlchemyError:
+                # The rows stay claimed and are retried once their lease expires
+                current_app.logger.exception("Recording delivery of %d notifications failed", len(batch))
+            else:
+                for key, count in counts.items():
+                    self.stats[key] += count
+
+    def _claim(self, after_id, now):
+        """Mark up to `batch_size` due rows as `sending` and return them"""
+        due = or_(
+            and_(
+                Notification.delivery_status == 'pending',
+                or_(Notification.next_attempt_at.is_(None), Notification.next_attempt_at <= now)
+            ),
+            # Claimed by a worker that never finished them
+            and_(Notification.delivery_status == 'sending', Notification.next_attempt_at <= now)
+        )
+        candidates = (
+            select(Notification.id)
+            .where(due, Notification.id > after_id)
+            .order_by(Notification.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        # `due` is repeated so a row another worker claimed meanwhile is skipped
+        with self._session() as session:
+            rows = session.execute(
+                update(Notification)
+                .where(Notification.id.in_(candidates.scalar_subquery()), due)
+                .values(delivery_status='sending', next_attempt_at=now + timedelta(seconds=self.lease_seconds))
+                .returning(*OUTBOX_COLUMNS)
+            ).all()
+        return sorted(RowSerializer(OUTBOX_COLUMNS).many(rows), key=lambda row: row['id'])
+
+    def _record_success(self, batch):
+        self._write(
+            update(Notification)
+            .where(Notification.id.in_([row['id'] for row in batch]))
+            .values(delivery_status='delivered', delivered_at=datetime.utcnow(), next_attempt_at=None)
+        )
+        return {"delivered": len(batch)}
+
+    def _record_failure(self, batch):
+        now = datetime.utcnow()
+        changes = []
+        counts = {"retried": 0, "failed": 0}
+        for row in batch:
+            attempts = row['delivery_attempts'] + 1
+            if attempts >= self.max_attempts:
+                changes.append({'id': row['id'], 'delivery_attempts': attempts, 'delivery_status': 'failed', 'next_attempt_at': None})
+                counts["failed"] += 1
+            else:
+                delay = timedelta(seconds=self.backoff_seconds * 2 ** (attempts - 1))
+                changes.append({'id': row['id'], 'delivery_attempts': attempts, 'delivery_status': 'pending', 'next_attempt_at': now + delay})
+                counts["retried"] += 1
+        self._write(update(Notification), changes)
+        return counts
+
+    def _write(self, statement, params=None):
+        with self._session() as session:
+            session.execute(statement, params)
+
+    @contextmanager
+    def _session(self):
+        # Database calls run in worker threads, so never on the shared scoped session
+        with db.session.session_factory() as session:
+            try:
+                yield session
+                session.commit()
+            except SQLAlchemyError:
+                session.rollback()
+                raise
+
+    @staticmethod
+    def _public(row):
+        return {key: value for key, value in row.items() if key != 'delivery_attempts'}
+
+@click.command('deliver-notifications')
+@click.option('--once', is_flag=True, help="Deliver what is due now and exit")
+@click.option('--tenant', default=None, help="Drain the outbox of a tenant listed in TENANT_DATABASES")
+@with_appcontext
+def deliver_notifications(once, tenant):
+    """Deliver pending notifications from the outbox."""
+    with tenant_scope(tenant):
+        _deliver_notifications(once)
+
+def _deliver_notifications(once):
+    config = current_app.config
+    worker = DeliveryWorker.from_config(config)
+    while True:
+        before = dict(worker.stats)
+        worker.drain()
+        delivered = worker.stats["delivered"] - before["delivered"]
+        if delivered or worker.stats["failed"] != before["failed"] or worker.stats["retried"] != before["retried"]:
+            current_app.logger.info(
+                "Delivered %d notifications (%.0f/s overall), %d retrying, %d failed",
+                delivered, worker.rate(), worker.stats["retried"], worker.stats["failed"]
+            )
+        if once:
+            click.echo(worker.stats)
+            return
+        time.sleep(config['DELIVERY_POLL_SECONDS'])
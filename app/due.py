@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, func, or_, select
+from app.models import Asset
+from app.pagination import parse_datetime
+from app.serializers import ASSET_COLUMNS, RowSerializer
+
+DUE_COLUMNS = {
+    'service': Asset.service_time,
+    'expiration': Asset.expiration_time,
+}
+
+BUCKETS = {
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+
+# Responses never hold more buckets than this, whatever the window
+MAX_BUCKETS = 24 * 92
+
+def parse_due_args(args):
+    """Read from/to/type/bucket for GET /assets/due, raising ValueError on bad input"""
+    try:
+        start = parse_datetime(args['from']) if 'from' in args else datetime.utcnow()
+        end = parse_datetime(args['to']) if 'to' in args else start + timedelta(hours=24)
+    except ValueError:
+        raise ValueError("from and to must be ISO 8601 times")
+    if end <= start:
+        raise ValueError("to must be after from")
+
+    types = [args['type']] if 'type' in args else list(DUE_COLUMNS)
+    if any(event_type not in DUE_COLUMNS for event_type in types):
+        raise ValueError(f"type must be one of: {', '.join(DUE_COLUMNS)}")
+
+    bucket = args.get('bucket')
+    if bucket is not None:
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}")
+        if (end - start) / BUCKETS[bucket] > MAX_BUCKETS:
+            raise ValueError(f"Window spans more than {MAX_BUCKETS} buckets")
+    elif len(types) > 1:
+        raise ValueError("Listing assets needs a type; counts per bucket accept both")
+    return start, end, types, bucket
+
+def due_buckets(session, tenant, start, end, types, bucket):
+    """Count a tenant's deadlines per bucket in [start, end), zero-filled, one row per bucket.
+
+    Each type is one GROUP BY over a range scan of its (tenant, time) index, so
+    only index entries inside the window are read.
+    """
+    step = BUCKETS[bucket]
+    first = _truncate(start, bucket)
+    series = {}
+    moment = first
+    while moment < end:
+        series[moment] = dict.fromkeys(types, 0)
+        moment += step
+
+    for event_type in types:
+        column = DUE_COLUMNS[event_type]
+        dialect = session.get_bind().dialect.name
+        key = _bucket_expression(dialect, column, bucket)
+        if key is None:
+            # Unknown dialect: bucket the raw values in Python
+            rows = ((value, 1) for value in session.execute(
+                select(column).where(Asset.tenant == tenant, column >= start, column < end)
+            ).scalars())
+        else:
+            rows = session.execute(
+                select(key, func.count()).where(Asset.tenant == tenant, column >= start, column < end).group_by(key)
+            )
+        for value, count in rows:
+            moment = _truncate(_as_datetime(value), bucket)
+            series[moment][event_type] += count
+
+    return [{"bucket": moment.isoformat(), **counts} for moment, counts in series.items()]
+
+def due_assets(session, tenant, start, end, event_type, cursor, limit):
+    """One page of a tenant's assets with a deadline in [start, end), soonest first.
+
+    Pages are keyed on (deadline, id) so every page is a range scan of the
+    deadline index that starts where the previous one stopped. The cursor
+    is "<deadline ISO time>,<id>". Returns the rows and the next cursor.
+    """
+    column = DUE_COLUMNS[event_type]
+    stmt = select(*ASSET_COLUMNS).where(Asset.tenant == tenant, column >= start, column < end)
+    if cursor is not None:
+        after, after_id = cursor
+        stmt = stmt.where(or_(column > after, and_(column == after, Asset.id > after_id)))
+    rows = session.execute(stmt.order_by(column, Asset.id).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = f"{getattr(last, column.key).isoformat()},{last.id}"
+    return RowSerializer(ASSET_COLUMNS).many(rows), next_cursor
+
+def parse_due_cursor(args):
+    """Read the (deadline, id) cursor and page size for the asset listing"""
+    try:
+        limit = int(args.get('limit', current_app.config['PAGE_SIZE']))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    limit = min(limit, current_app.config['MAX_PAGE_SIZE'])
+    if 'cursor' not in args:
+        return None, limit
+    try:
+        after, after_id = args['cursor'].rsplit(',', 1)
+        return (parse_datetime(after), int(after_id)), limit
+    except ValueError:
+        raise ValueError("cursor must be the next_cursor of a previous page")
+
+def _bucket_expression(dialect, column, bucket):
+    if dialect == 'sqlite':
+        return func.strftime('%Y-%m-%d %H:00:00' if bucket == 'hour' else '%Y-%m-%d 00:00:00', column)
+    if dialect == 'postgresql':
+        return func.date_trunc(bucket, column)
+    if dialect in ('mysql', 'mariadb'):
+        return func.date_format(column, '%Y-%m-%d %H:00:00' if bucket == 'hour' else '%Y-%m-%d 00:00:00')
+    return None
+
+def _truncate(moment, bucket):
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if bucket == 'day' else moment
+
+def _as_datetime(value):
+    # strftime / date_format come back as strings
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
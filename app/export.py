@@ -0,0 +1,35 @@
+import json
+import zlib
+from sqlalchemy import select
+from app import db
+from app.serializers import RowSerializer
+from app.tenancy import tenant_scope
+
+def export_lines(model, columns, tenant, since=None, batch_size=1000):
+    """Yield one NDJSON line per row of a tenant, oldest first.
+
+    Rows are read through a server-side cursor in batches of `batch_size` and
+    serialized straight from column tuples, so memory stays flat regardless
+    of how many rows are exported.
+    """
+    serialize = RowSerializer(columns)
+    stmt = select(*columns).where(model.tenant == tenant).order_by(model.id).execution_options(yield_per=batch_size)
+    if since is not None:
+        stmt = stmt.where(model.created_at >= since)
+
+    dumps = json.JSONEncoder(separators=(',', ':')).encode
+    # The stream runs after the view returned, so route to the tenant's database here
+    with tenant_scope(tenant):
+        for row in db.session.execute(stmt):
+            yield dumps(serialize(row)) + "\n"
+
+def gzip_stream(lines, flush_every=1000):
+    """Gzip-compress a stream of text lines, flushing every `flush_every` lines"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    buffered = []
+    for line in lines:
+        buffered.append(line.encode())
+        if len(buffered) >= flush_every:
+            yield compressor.compress(b"".join(buffered))
+            buffered = []
+    yield compressor.compress(b"".join(buffered)) + compressor.flush()
@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+from flask import current_app
+from sqlalchemy import delete, func, select, update
+from app.models import Asset, ChangeEvent, FeedSequence, Notification, Violation
+from app.serializers import NOTIFICATION_COLUMNS, VIOLATION_COLUMNS, RowSerializer
+from app.tenancy import tenant_scope
+
+# Feed kind -> (model, columns of the published record)
+KINDS = {
+    'notification': (Notification, NOTIFICATION_COLUMNS),
+    'violation': (Violation, VIOLATION_COLUMNS),
+}
+
+def record_changes(session, created_at, criteria=(), keep=100000):
+    """Append the notifications and violations created at `created_at` to their tenants' feeds.
+
+    `check_assets` stamps every row it writes with the run's `now`, so the new
+    rows are found with one lookup on each created_at index. Sequence numbers are
+    taken from the tenant's FeedSequence row, whose lock is held until the
+    caller commits: a reader never sees a higher `seq` commit before a lower
+    one. Entries more than `keep` behind the newest are pruned.
+    """
+    new = {}
+    for kind, (model, _) in KINDS.items():
+        rows = session.execute(
+            select(model.tenant, model.id)
+            .join(Asset, Asset.id == model.asset_id)
+            .where(model.created_at == created_at, *criteria)
+            .order_by(model.id)
+        )
+        for tenant, record_id in rows:
+            new.setdefault(tenant, []).append((kind, record_id))
+
+    for tenant, records in new.items():
+        last = _allocate(session, tenant, len(records))
+        first = last - len(records) + 1
+        session.execute(ChangeEvent.__table__.insert(), [
+            {'tenant': tenant, 'seq': seq, 'kind': kind, 'record_id': record_id, 'created_at': created_at}
+            for seq, (kind, record_id) in enumerate(records, first)
+        ])
+        if keep:
+            session.execute(delete(ChangeEvent).where(ChangeEvent.tenant == tenant, ChangeEvent.seq <= last - keep))
+
+def read_changes(session, tenant, after, limit):
+    """Up to `limit` feed entries of a tenant after `after`, with their records.
+
+    One primary key range read of the feed plus one id lookup per kind, so
+    the cost follows the number of new entries. Entries whose record was
+    since deleted are skipped.
+    """
+    entries = session.execute(
+        select(ChangeEvent.seq, ChangeEvent.kind, ChangeEvent.record_id)
+        .where(ChangeEvent.tenant == tenant, ChangeEvent.seq > after)
+        .order_by(ChangeEvent.seq)
+        .limit(limit)
+    ).all()
+
+    records = {}
+    for kind, (model, columns) in KINDS.items():
+        ids = [record_id for _, entry_kind, record_id in entries if entry_kind == kind]
+        if ids:
+            serialize = RowSerializer(columns)
+            for row in session.execute(select(*columns).where(model.id.in_(ids))):
+                records[kind, row.id] = serialize(row)
+
+    return [
+        {'seq': seq, 'type': kind, 'data': records[kind, record_id]}
+        for seq, kind, record_id in entries if (kind, record_id) in records
+    ], (entries[-1].seq if entries else after)
+
+def parse_feed_args(args, last_event_id=None):
+    """Read after/limit/timeout for the feed endpoints, raising ValueError on bad input.
+
+    `after` falls back to an SSE client's Last-Event-ID, then to None, which
+    means "only what is new from now on".
+    """
+    config = current_app.config
+    try:
+        after = args.get('after', last_event_id)
+        after = int(after) if after not in (None, '') else None
+        limit = int(args.get('limit', config['PAGE_SIZE']))
+        timeout = float(args.get('timeout', config['FEED_LONG_POLL_SECONDS']))
+    except ValueError:
+        raise ValueError("after, limit and timeout must be numbers")
+    if (after is not None and after < 0) or limit < 1 or timeout < 0:
+        raise ValueError("after, limit and timeout must not be negative")
+    return after, min(limit, config['MAX_PAGE_SIZE']), min(timeout, config['FEED_LONG_POLL_SECONDS'])
+
+def check_after(session, tenant, after):
+    """Raise LookupError when entries after `after` were already pruned"""
+    oldest = oldest_seq(session, tenant)
+    if oldest and after < oldest - 1:
+        raise LookupError(oldest)
+
+def sse_stream(session, tenant, after, limit, heartbeat):
+    """Yield the tenant's feed as Server-Sent Events, forever.
+
+    Each entry is one event named after its type, with `seq` as its id so a
+    reconnecting client resumes through Last-Event-ID. A comment line goes
+    out every `heartbeat` idle seconds, which also notices closed clients.
+    """
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+    yield "retry: 1000\n\n"
+    # The stream outlives the request's tenant, so route to the tenant's database here
+    with tenant_scope(tenant):
+        if after is None:
+            after = change_feed.newest(session, tenant)
+        else:
+            try:
+                check_after(session, tenant, after)
+            except LookupError as e:
+                yield f"event: reset\ndata: {encode({'oldest_seq': e.args[0]})}\n\n"
+                after = e.args[0] - 1
+
+        while True:
+            events, after = read_changes(session, tenant, after, limit)
+            session.close()
+            for event in events:
+                yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {encode(event['data'])}\n\n"
+            if len(events) < limit and not change_feed.wait(session, tenant, after, heartbeat):
+                yield ": keepalive\n\n"
+
+def oldest_seq(session, tenant):
+    """The oldest `seq` still in a tenant's feed, 0 when it is empty.
+
+    A lone MIN over the (tenant, seq) key is one index seek; asking for MIN
+    and MAX together would scan the tenant's whole feed.
+    """
+    return session.execute(select(func.min(ChangeEvent.seq)).where(ChangeEvent.tenant == tenant)).scalar() or 0
+
+def _allocate(session, tenant, count):
+    from app.utils import insert_ignore
+
+    bumped = session.execute(
+        update(FeedSequence).where(FeedSequence.tenant == tenant).values(value=FeedSequence.value + count)
+    ).rowcount
+    if not bumped and not insert_ignore(session, FeedSequence, [{'tenant': tenant, 'value': count}]):
+        # Another writer created the row first
+        session.execute(
+            update(FeedSequence).where(FeedSequence.tenant == tenant).values(value=FeedSequence.value + count)
+        )
+    return session.execute(select(FeedSequence.value).where(FeedSequence.tenant == tenant)).scalar_one()
+
+class ChangeFeed:
+    """Wakes long-poll and SSE requests when their tenant's feed moves.
+
+    `publish` is called after a check run commits and wakes the waiters in
+    this process at once. Writes committed by other processes are seen through
+    the newest `seq`, which is read at most once per FEED_POLL_SECONDS per
+    tenant however many clients are waiting.
+    """
+
+    def __init__(self, app=None):
+        self.poll = 0.5
+        self._newest = {}
+        self._generation = 0
+        self._condition = threading.Condition()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.poll = app.config['FEED_POLL_SECONDS']
+        app.extensions['change_feed'] = self
+
+    def publish(self):
+        """Wake every waiter to re-read its tenant's newest `seq`"""
+        with self._condition:
+            self._newest.clear()
+            self._generation += 1
+            self._condition.notify_all()
+
+    def newest(self, session, tenant):
+        """The newest `seq` of a tenant, cached for one poll interval"""
+        with self._condition:
+            cached = self._newest.get(tenant)
+        if cached is not None and time.monotonic() - cached[1] < self.poll:
+            return cached[0]
+        seq = session.execute(select(func.max(ChangeEvent.seq)).where(ChangeEvent.tenant == tenant)).scalar() or 0
+        # The read ends here; nothing holds a connection while waiting
+        session.close()
+        with self._condition:
+            current = self._newest.get(tenant)
+            if current is None or current[0] <= seq:
+                self._newest[tenant] = (seq, time.monotonic())
+        return seq
+
+    def wait(self, session, tenant, after, timeout):
+        """Block until the tenant's feed passes `after` or `timeout` seconds pass; True if it did"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                generation = self._generation
+            if self.newest(session, tenant) > after:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            with self._condition:
+                if generation == self._generation:
+                    self._condition.wait(min(self.poll, remaining))
+
+change_feed = ChangeFeed()
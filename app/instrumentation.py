@@ -0,0 +1,188 @@
+import cProfile
+import heapq
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+class Metrics:
+    """Process-local counters rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}
+            self.sql = {'count': 0, 'seconds': 0.0}
+            self.serialize_seconds = 0.0
+            self.checks = {'runs': 0, 'seconds': 0.0, 'notifications': 0, 'violations': 0, 'resolved': 0}
+
+    def observe_request(self, method, endpoint, status, seconds, serialize_seconds):
+        key = (method, endpoint, status)
+        with self._lock:
+            entry = self.requests.setdefault(key, {'count': 0, 'seconds': 0.0, 'buckets': [0] * len(DURATION_BUCKETS)})
+            entry['count'] += 1
+            entry['seconds'] += seconds
+            for position, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    entry['buckets'][position] += 1
+            self.serialize_seconds += serialize_seconds
+
+    def observe_sql(self, seconds):
+        with self._lock:
+            self.sql['count'] += 1
+            self.sql['seconds'] += seconds
+
+    def observe_check(self, result, seconds):
+        with self._lock:
+            self.checks['runs'] += 1
+            self.checks['seconds'] += seconds
+            self.checks['notifications'] += result.get('notifications', 0)
+            self.checks['violations'] += result.get('violations', 0)
+            self.checks['resolved'] += result.get('resolved', 0)
+
+    def render(self, extra=()):
+        lines = [
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (method, endpoint, status), entry in sorted(self.requests.items()):
+                labels = f'method="{method}",endpoint="{endpoint}",status="{status}"'
+                for bound, count in zip(DURATION_BUCKETS, entry['buckets']):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+                lines.append(f'http_request_duration_seconds_sum{{{labels}}} {entry["seconds"]:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{{labels}}} {entry["count"]}')
+            lines += [
+                "# TYPE sql_statements_total counter",
+                f"sql_statements_total {self.sql['count']}",
+                "# TYPE sql_statement_seconds_total counter",
+                f"sql_statement_seconds_total {self.sql['seconds']:.6f}",
+                "# TYPE serialization_seconds_total counter",
+                f"serialization_seconds_total {self.serialize_seconds:.6f}",
+                "# TYPE check_runs_total counter",
+                f"check_runs_total {self.checks['runs']}",
+                "# TYPE check_run_seconds_total counter",
+                f"check_run_seconds_total {self.checks['seconds']:.6f}",
+                "# TYPE check_notifications_created_total counter",
+                f"check_notifications_created_total {self.checks['notifications']}",
+                "# TYPE check_violations_created_total counter",
+                f"check_violations_created_total {self.checks['violations']}",
+                "# TYPE check_violations_resolved_total counter",
+                f"check_violations_resolved_total {self.checks['resolved']}",
+            ]
+        for name, kind, value in extra:
+            lines += [f"# TYPE {name} {kind}", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+class SlowestProfiles:
+    """Keeps the cProfile dumps of the `keep` slowest sampled requests on disk"""
+
+    def __init__(self, directory, keep):
+        self.directory = directory
+        self.keep = keep
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def offer(self, profiler, seconds, endpoint):
+        with self._lock:
+            if len(self._heap) >= self.keep and seconds <= self._heap[0][0]:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{seconds * 1000:.0f}ms-{endpoint}-{time.time_ns()}.prof")
+            profiler.dump_stats(path)
+            heapq.heappush(self._heap, (seconds, path))
+            if len(self._heap) > self.keep:
+                _, evicted = heapq.heappop(self._heap)
+                os.remove(evicted)
+
+_enabled = False
+
+def init_app(app):
+    """Record per-request timings, SQL statements and serialization time.
+
+    Exposes them at /metrics and in a Server-Timing header on every response;
+    with PROFILE_SAMPLE_RATE > 0 a sample of requests is run under cProfile
+    and the slowest PROFILE_KEEP dumps are kept in PROFILE_DIR.
+    """
+    global _enabled
+    _enabled = True
+    sample_rate = app.config['PROFILE_SAMPLE_RATE']
+    profiles = SlowestProfiles(app.config['PROFILE_DIR'], app.config['PROFILE_KEEP'])
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_timing():
+        g.instrumentation = {'started': time.perf_counter(), 'sql_count': 0, 'sql_seconds': 0.0, 'serialize_seconds': 0.0}
+        if sample_rate and random.random() < sample_rate:
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def record_timing(response):
+        timings = g.pop('instrumentation', None)
+        if timings is None:
+            return response
+        seconds = time.perf_counter() - timings['started']
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            profiles.offer(profiler, seconds, request.endpoint or 'unknown')
+
+        metrics.observe_request(
+            request.method, request.endpoint or 'unknown', response.status_code, seconds,
+            timings['serialize_seconds']
+        )
+        response.headers['Server-Timing'] = (
+            f"app;dur={seconds * 1000:.2f}, "
+            f"db;dur={timings['sql_seconds'] * 1000:.2f};desc=\"{timings['sql_count']} queries\", "
+            f"serialize;dur={timings['serialize_seconds'] * 1000:.2f}"
+        )
+        return response
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        extra = []
+        cache = app.extensions.get('response_cache')
+        if cache is not None:
+            extra += [('cache_hits_total', 'counter', cache.hits), ('cache_misses_total', 'counter', cache.misses)]
+        return Response(metrics.render(extra), mimetype='text/plain; version=0.0.4')
+
+@contextmanager
+def serialization_timer():
+    """Add the time spent in the block to the current request's serialization time"""
+    if not (_enabled and has_request_context() and 'instrumentation' in g):
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        g.instrumentation['serialize_seconds'] += time.perf_counter() - started
+
+def record_check(result, seconds):
+    if _enabled:
+        metrics.observe_check(result, seconds)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info['query_started'].pop()
+    metrics.observe_sql(seconds)
+    if has_request_context() and 'instrumentation' in g:
+        g.instrumentation['sql_count'] += 1
+        g.instrumentation['sql_seconds'] += seconds
@@ -1,25 +1,109 @@
 # app/models.py
 from datetime import datetime
 from app import db
+from app.tenancy import DEFAULT_TENANT
 
 class Asset(db.Model):
+    __table_args__ = (
+        # Names are unique per tenant; also serves the tenant list and name lookups
+        db.Index('uq_asset_tenant_name', 'tenant', 'name', unique=True),
+        # Range scans of one tenant's deadlines; they replace the single-column
+        # deadline indexes, since every deadline query filters on tenant first
+        db.Index('ix_asset_tenant_service_time', 'tenant', 'service_time'),
+        db.Index('ix_asset_tenant_expiration_time', 'tenant', 'expiration_time'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), unique=True, nullable=False)
+    tenant = db.Column(db.String(50), nullable=False, default=DEFAULT_TENANT, server_default=DEFAULT_TENANT)
+    name = db.Column(db.String(100), nullable=False)
     service_time = db.Column(db.DateTime, nullable=True)
     expiration_time = db.Column(db.DateTime, nullable=True)
     last_serviced = db.Column(db.DateTime, nullable=True)
+    # Recurring schedule: service_time is recomputed from last_serviced using
+    # one of these, so it always holds the next precomputed deadline
+    service_interval_minutes = db.Column(db.Integer, nullable=True)
+    service_cron = db.Column(db.String(100), nullable=True)
 
 class Notification(db.Model):
+    __table_args__ = (
+        # Dedup key for run_checks: one notification per asset, event and deadline
+        db.Index('uq_notification_asset_event_time', 'asset_id', 'event_type', 'event_time', unique=True),
+        # Outbox scan for the delivery worker
+        db.Index('ix_notification_delivery', 'delivery_status', 'id'),
+        # Keyset pages of one tenant
+        db.Index('ix_notification_tenant', 'tenant', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
+    tenant = db.Column(db.String(50), nullable=False, default=DEFAULT_TENANT, server_default=DEFAULT_TENANT)
     asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False)
     message = db.Column(db.String(255), nullable=False)
     event_type = db.Column(db.String(20), nullable=False)
     event_time = db.Column(db.DateTime, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # Outbox state: pending -> sending -> delivered, or back to pending for a
+    # retry and failed once retries run out. While sending, next_attempt_at is
+    # when the worker's claim expires.
+    delivery_status = db.Column(db.String(20), nullable=False, default='pending', server_default='pending')
+    delivery_attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    next_attempt_at = db.Column(db.DateTime, nullable=True)
+    delivered_at = db.Column(db.DateTime, nullable=True)
 
 class Violation(db.Model):
+    __table_args__ = (
+        # Dedup key for run_checks: one violation per asset, event and missed deadline
+        db.Index('uq_violation_asset_event_deadline', 'asset_id', 'event_type', 'deadline', unique=True),
+        # The open set scanned when resolving; partial where the database supports it
+        db.Index(
+            'ix_violation_open', 'asset_id', 'event_type',
+            sqlite_where=db.text("status = 'open'"), postgresql_where=db.text("status = 'open'")
+        ),
+        # Keyset pages of one tenant
+        db.Index('ix_violation_tenant', 'tenant', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
+    tenant = db.Column(db.String(50), nullable=False, default=DEFAULT_TENANT, server_default=DEFAULT_TENANT)
     asset_id = db.Column(db.Integer, db.ForeignKey('asset.id'), nullable=False)
     message = db.Column(db.String(255), nullable=False)
     event_type = db.Column(db.String(20), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    # The missed service_time or expiration_time
+    deadline = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # open -> resolved once the asset is serviced or the deadline moves
+    status = db.Column(db.String(20), nullable=False, default='open', server_default='open')
+    resolved_at = db.Column(db.DateTime, nullable=True)
+
+class CheckLease(db.Model):
+    """Lease row that lets only one node run scheduled checks at a time"""
+    name = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(100), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class StatCounter(db.Model):
+    """Named gauge per tenant, refreshed by each full check run and served by /stats"""
+    tenant = db.Column(db.String(50), primary_key=True)
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+class DailyViolationCount(db.Model):
+    """Violations created per tenant, UTC day and event type, incremented as they are written"""
+    tenant = db.Column(db.String(50), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    event_type = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.BigInteger, nullable=False, default=0)
+
+class ChangeEvent(db.Model):
+    """One entry of a tenant's change feed, numbered by `seq` in commit order"""
+    tenant = db.Column(db.String(50), primary_key=True)
+    seq = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    # 'notification' or 'violation', and the id of that row
+    kind = db.Column(db.String(20), nullable=False)
+    record_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+
+class FeedSequence(db.Model):
+    """Last `seq` handed out per tenant; its row lock orders concurrent writers"""
+    tenant = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
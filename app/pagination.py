@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+from flask import current_app
+
+# Parsers for the filter operators accepted on list endpoints
+FILTER_OPERATORS = {
+    'eq': lambda column, value: column == value,
+    'gte': lambda column, value: column >= value,
+    'lt': lambda column, value: column < value,
+}
+
+def parse_datetime(value):
+    """Parse an ISO 8601 time into the naive UTC the database stores"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def parse_page_args(args):
+    """Read the keyset cursor and page size from the query string"""
+    try:
+        cursor = int(args['cursor']) if 'cursor' in args else None
+        limit = int(args.get('limit', current_app.config['PAGE_SIZE']))
+    except ValueError:
+        raise ValueError("cursor and limit must be integers")
+
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return cursor, min(limit, current_app.config['MAX_PAGE_SIZE'])
+
+def apply_filters(query, args, filters):
+    """Apply the query string filters declared for an endpoint.
+
+    `filters` maps a query parameter to a (column, operator, parser) tuple.
+    """
+    for param, (column, operator, parser) in filters.items():
+        if param not in args:
+            continue
+        try:
+            value = parser(args[param])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for {param}")
+        query = query.filter(FILTER_OPERATORS[operator](column, value))
+    return query
+
+def paginate(query, id_column, cursor, limit):
+    """Fetch one page ordered by id, returning the rows and the next cursor.
+
+    One extra row is read to find out whether another page exists, so the
+    response never holds more than `limit` rows no matter how large the table is.
+    """
+    if cursor is not None:
+        query = query.filter(id_column > cursor)
+    rows = query.order_by(id_column).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
+    return rows, next_cursor
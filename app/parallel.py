@@ -0,0 +1,55 @@
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from app import database, db
+from app.models import Asset
+from app.utils import check_assets
+
+_engine = None
+
+def run_checks_parallel(now, upcoming, shards, tenant=None, keep=100000):
+    """Split the Asset id space into `shards` ranges and check them in a process pool.
+
+    Every worker opens its own engine and commits its own shard; the counts are
+    merged into the same shape `run_checks` returns. All shards share one `now`,
+    so the outcome is identical to a serial run. With a `tenant` only its
+    assets are split, in the database it is routed to. Workers have no app
+    context, so settings such as `keep` are passed in.
+    """
+    criteria = [Asset.tenant == tenant] if tenant is not None else []
+    low, high = db.session.execute(select(func.min(Asset.id), func.max(Asset.id)).where(*criteria)).one()
+    result = {"notifications": 0, "violations": 0, "resolved": 0}
+    if low is None:
+        return result
+
+    url = db.session.get_bind().url.render_as_string(hide_password=False)
+    options = current_app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    pragmas = current_app.config['SQLITE_PRAGMAS']
+    bounds = shard_bounds(low, high, shards)
+    with ProcessPoolExecutor(max_workers=len(bounds), initializer=_init_worker, initargs=(url, options, pragmas)) as pool:
+        futures = [pool.submit(_check_shard, first, last, now, upcoming, tenant, keep) for first, last in bounds]
+        for future in futures:
+            shard = future.result()
+            for key in result:
+                result[key] += shard[key]
+    return result
+
+def shard_bounds(low, high, shards):
+    """Inclusive, contiguous id ranges covering low..high"""
+    size = -(-(high - low + 1) // shards)
+    return [(first, min(first + size - 1, high)) for first in range(low, high + 1, size)]
+
+def _init_worker(url, options, pragmas):
+    global _engine
+    database.use_sqlite_pragmas(pragmas)
+    _engine = create_engine(url, **options)
+
+def _check_shard(first, last, now, upcoming, tenant, keep):
+    criteria = [Asset.id.between(first, last)]
+    if tenant is not None:
+        criteria.append(Asset.tenant == tenant)
+    with Session(_engine) as session:
+        result = check_assets(session, now, upcoming, criteria, keep)
+        session.commit()
+        return result
@@ -7,6 +7,12 @@ def success_response(data, message="Success", status_code=200):
         "data": data
     }, status_code
 
+def paginated_response(data, next_cursor, message="Success", status_code=200):
+    """Success response for one page of a keyset-paginated list"""
+    response, status_code = success_response(data, message, status_code)
+    response["next_cursor"] = next_cursor
+    return response, status_code
+
 def error_response(message, status_code=400, errors=None):
     """Standard error response format"""
     response = {
@@ -0,0 +1,126 @@
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.models import Notification, Violation
+from app.serializers import NOTIFICATION_COLUMNS, VIOLATION_COLUMNS, RowSerializer
+from app.tenancy import tenant_scope
+
+# Policy name -> (model, archived columns)
+TABLES = {
+    'notification': (Notification, NOTIFICATION_COLUMNS),
+    'violation': (Violation, VIOLATION_COLUMNS),
+}
+
+def apply_retention(session, policies, archive_dir, batch_size=1000, pause=0.0, now=None, dry_run=False):
+    """Archive rows older than their policy and delete them from the hot tables.
+
+    Each batch of at most `batch_size` rows is appended to a gzip NDJSON file
+    under `archive_dir/<table>/` and synced to disk before the same ids are
+    deleted and committed, so write locks are held for one batch at a time
+    and a crash can at worst archive a batch twice, never lose it. `pause`
+    seconds are slept between batches to let other writers in.
+
+    Pending notifications are kept until delivered and open violations until
+    they are resolved.
+    Returns {table: {event_type: rows archived}}.
+    """
+    now = now or datetime.utcnow()
+    result = {}
+    for table, rules in policies.items():
+        model, columns = TABLES[table]
+        path = os.path.join(archive_dir, table, f"{table}-{now:%Y-%m-%d}.ndjson.gz")
+        for event_type, days in rules.items():
+            if days <= 0:
+                continue
+            criteria = [model.created_at < now - timedelta(days=days), *_archivable(model)]
+            if event_type == '*':
+                explicit = [name for name in rules if name != '*']
+                if explicit:
+                    criteria.append(model.event_type.notin_(explicit))
+            else:
+                criteria.append(model.event_type == event_type)
+
+            stmt = select(*columns).where(*criteria).order_by(model.id).limit(batch_size)
+            result.setdefault(table, {})[event_type] = (
+                _count(session, model, criteria) if dry_run
+                else _archive_batches(session, model, columns, stmt, path, pause)
+            )
+    return result
+
+def compact(session):
+    """Return the space freed by deleted rows to the database file or planner"""
+    bind = session.get_bind()
+    if bind.dialect.name not in ('sqlite', 'postgresql'):
+        return
+    statement = 'VACUUM' if bind.dialect.name == 'sqlite' else 'VACUUM ANALYZE'
+    # VACUUM cannot run inside a transaction
+    with bind.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        connection.execute(text(statement))
+
+@click.command('apply-retention')
+@click.option('--dry-run', is_flag=True, help="Only count the rows that would be archived")
+@click.option('--compact', 'compact_after', is_flag=True, help="VACUUM the database afterwards")
+@click.option('--tenant', default=None, help="Apply to the database of a tenant listed in TENANT_DATABASES")
+@with_appcontext
+def apply_retention_command(dry_run, compact_after, tenant):
+    """Archive and delete notifications and violations past their retention."""
+    config = current_app.config
+    archive_dir = config['RETENTION_ARCHIVE_DIR']
+    if tenant is not None:
+        archive_dir = os.path.join(archive_dir, tenant)
+    with tenant_scope(tenant):
+        result = apply_retention(
+            db.session,
+            config['RETENTION_POLICIES'],
+            archive_dir,
+            batch_size=config['RETENTION_BATCH_SIZE'],
+            pause=config['RETENTION_PAUSE_SECONDS'],
+            dry_run=dry_run
+        )
+        if compact_after and not dry_run:
+            compact(db.session)
+    click.echo(result)
+
+def _archivable(model):
+    if model is Notification:
+        return [Notification.delivery_status.not_in(('pending', 'sending'))]
+    return [Violation.status == 'resolved']
+
+def _archive_batches(session, model, columns, stmt, path, pause):
+    serialize = RowSerializer(columns)
+    dumps = json.JSONEncoder(separators=(',', ':')).encode
+    archived = 0
+    while True:
+        try:
+            rows = session.execute(stmt).all()
+            if not rows:
+                session.commit()
+                return archived
+            _append(path, "".join(dumps(serialize(row)) + "\n" for row in rows))
+            session.execute(delete(model).where(model.id.in_([row.id for row in rows])))
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+        archived += len(rows)
+        if pause:
+            time.sleep(pause)
+
+def _append(path, lines):
+    # Each batch becomes its own gzip member; readers see one continuous stream
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'ab') as handle:
+        handle.write(gzip.compress(lines.encode()))
+        handle.flush()
+        os.fsync(handle.fileno())
+
+def _count(session, model, criteria):
+    return session.execute(select(func.count(model.id)).where(*criteria)).scalar_one()
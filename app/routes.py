@@ -1,22 +1,179 @@
-from flask import Blueprint, request
+from flask import Blueprint, Response, current_app, g, request, stream_with_context
 from flask_restful import Api, Resource
 from app import db
 from app.models import Asset, Notification, Violation
-from app.schemas import asset_schema, assets_schema, notification_schema, notifications_schema, violation_schema, violations_schema
-from app.utils import run_checks
-from app.response_model import success_response, error_response
-from flasgger import swag_from
+from app.schemas import asset_schema
+from app.utils import resolve_violations, run_checks
+from app.schedules import next_service_time
+from app.stats import read_stats
+from app.response_model import success_response, paginated_response, error_response
+from app.pagination import parse_datetime, parse_page_args, apply_filters, paginate
+from app.export import export_lines, gzip_stream
+from app.bulk import parse_bulk_body, ingest_assets, parse_selection, parse_patch_values, patch_assets, delete_assets, delete_asset_rows
+from app.serializers import RowSerializer, ASSET_COLUMNS, NOTIFICATION_COLUMNS, VIOLATION_COLUMNS, output_json
+from app.cache import response_cache, asset_key, asset_list_key, asset_due_key, invalidate_assets
+from app.due import DUE_COLUMNS, BUCKETS, parse_due_args, parse_due_cursor, due_assets, due_buckets
+from app.docs import swag_from
+from app.feed import change_feed, check_after, parse_feed_args, read_changes, sse_stream
+from app.tenancy import current_tenant, parse_tenant, reset_tenant, set_tenant
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 
 api_bp = Blueprint('api', __name__)
 api = Api(api_bp)
+api.representations['application/json'] = output_json
+
+@api_bp.before_request
+def enter_tenant():
+    """Scope the request to the tenant named in TENANT_HEADER"""
+    try:
+        tenant = parse_tenant(request.headers.get(current_app.config['TENANT_HEADER']))
+    except ValueError as e:
+        return output_json(*error_response("Invalid tenant", 400, {"details": str(e)}))
+    g.tenant_token = set_tenant(tenant)
+
+@api_bp.teardown_request
+def leave_tenant(exception=None):
+    token = g.pop('tenant_token', None)
+    if token is not None:
+        reset_tenant(token)
+
+PAGINATION_PARAMETERS = [
+    {
+        'name': 'cursor',
+        'in': 'query',
+        'type': 'integer',
+        'required': False,
+        'description': 'Return records with an id greater than this value (next_cursor of the previous page)'
+    },
+    {
+        'name': 'limit',
+        'in': 'query',
+        'type': 'integer',
+        'required': False,
+        'description': 'Maximum number of records to return'
+    }
+]
+
+ASSET_FILTERS = {
+    'name': (Asset.name, 'eq', str),
+    'service_from': (Asset.service_time, 'gte', parse_datetime),
+    'service_to': (Asset.service_time, 'lt', parse_datetime),
+    'expiration_from': (Asset.expiration_time, 'gte', parse_datetime),
+    'expiration_to': (Asset.expiration_time, 'lt', parse_datetime),
+}
+
+NOTIFICATION_FILTERS = {
+    'asset_id': (Notification.asset_id, 'eq', int),
+    'event_type': (Notification.event_type, 'eq', str),
+    'created_from': (Notification.created_at, 'gte', parse_datetime),
+    'created_to': (Notification.created_at, 'lt', parse_datetime),
+}
+
+VIOLATION_FILTERS = {
+    'asset_id': (Violation.asset_id, 'eq', int),
+    'event_type': (Violation.event_type, 'eq', str),
+    'status': (Violation.status, 'eq', str),
+    'created_from': (Violation.created_at, 'gte', parse_datetime),
+    'created_to': (Violation.created_at, 'lt', parse_datetime),
+}
+
+def filter_parameters(filters):
+    """Swagger query parameters for an endpoint's filters"""
+    parameters = []
+    for name, (_, _, parser) in filters.items():
+        parameter = {
+            'name': name,
+            'in': 'query',
+            'type': 'integer' if parser is int else 'string',
+            'required': False
+        }
+        if parser is parse_datetime:
+            parameter['format'] = 'date-time'
+        parameters.append(parameter)
+    return parameters
+
+EXPORT_PARAMETERS = [
+    {
+        'name': 'since',
+        'in': 'query',
+        'type': 'string',
+        'format': 'date-time',
+        'required': False,
+        'description': 'Only export records created at or after this time (incremental pulls)'
+    },
+    {
+        'name': 'gzip',
+        'in': 'query',
+        'type': 'boolean',
+        'required': False,
+        'description': 'Gzip-compress the stream'
+    }
+]
+
+BULK_CHANGE_PARAMETERS = [
+    {
+        'name': 'batch_size',
+        'in': 'query',
+        'type': 'integer',
+        'required': False,
+        'description': 'Assets changed per statement'
+    },
+    {
+        'name': 'atomic',
+        'in': 'query',
+        'type': 'boolean',
+        'required': False,
+        'description': 'Commit everything at once (default) or, with false, one transaction per batch'
+    }
+]
+
+def parse_bulk_change_args(args):
+    """Read batch_size and atomic for bulk PATCH/DELETE"""
+    batch_size = args.get('batch_size', current_app.config['BULK_BATCH_SIZE'], type=int)
+    if batch_size is None or batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    return batch_size, args.get('atomic', 'true').lower() not in ('0', 'false', 'no')
+
+def export_response(model, columns):
+    """Stream a model's rows as NDJSON, optionally gzip-compressed"""
+    try:
+        since = parse_datetime(request.args['since']) if 'since' in request.args else None
+    except ValueError as e:
+        return error_response("Invalid query parameters", 400, {"details": str(e)})
+
+    stream = export_lines(model, columns, current_tenant(), since, current_app.config['EXPORT_BATCH_SIZE'])
+    headers = {}
+    if request.args.get('gzip', '').lower() in ('1', 'true', 'yes'):
+        stream = gzip_stream(stream)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream_with_context(stream), mimetype='application/x-ndjson', headers=headers)
+
+def list_page(model, columns, filters):
+    """Serialize one filtered, keyset-paginated page of the current tenant's rows.
+
+    Only the listed columns are selected and rows are serialized straight from
+    tuples, producing the same objects as the model's marshmallow schema.
+    """
+    try:
+        cursor, limit = parse_page_args(request.args)
+        query = db.session.query(*columns).filter(model.tenant == current_tenant())
+        query = apply_filters(query, request.args, filters)
+    except ValueError as e:
+        return error_response("Invalid query parameters", 400, {"details": str(e)})
+
+    try:
+        rows, next_cursor = paginate(query, model.id, cursor, limit)
+        return paginated_response(RowSerializer(columns).many(rows), next_cursor)
+    except SQLAlchemyError as e:
+        return error_response("Database error", 500, {"details": str(e)})
 
 class AssetResource(Resource):
     @swag_from({
+        'parameters': PAGINATION_PARAMETERS + filter_parameters(ASSET_FILTERS),
         'responses': {
             200: {
-                'description': 'List of all assets',
+                'description': 'One page of assets',
                 'schema': {
                     'type': 'object',
                     'properties': {
@@ -26,20 +183,19 @@ class AssetResource(Resource):
                         'data': {
                             'type': 'array',
                             'items': {'$ref': '#/definitions/Asset'}
-                        }
+                        },
+                        'next_cursor': {'type': 'integer'}
                     }
                 }
             }
         }
     })
     def get(self):
-        """List all assets"""
-        try:
-            assets = Asset.query.all()
-            data = assets_schema.dump(assets)
-            return success_response(data)
-        except SQLAlchemyError as e:
-            return error_response("Database error", 500, {"details": str(e)})
+        """List assets, one page at a time"""
+        return response_cache.respond(
+            asset_list_key(request.args),
+            lambda: list_page(Asset, ASSET_COLUMNS, ASSET_FILTERS)
+        )
 
     @swag_from({
         'parameters': [{
@@ -52,7 +208,9 @@ class AssetResource(Resource):
                     'name': {'type': 'string'},
                     'service_time': {'type': 'string', 'format': 'date-time'},
                     'expiration_time': {'type': 'string', 'format': 'date-time'},
-                    'last_serviced': {'type': 'string', 'format': 'date-time'}
+                    'last_serviced': {'type': 'string', 'format': 'date-time'},
+                    'service_interval_minutes': {'type': 'integer'},
+                    'service_cron': {'type': 'string'}
                 },
                 'required': ['name']
             }
@@ -94,20 +252,28 @@ class AssetResource(Resource):
             return error_response("Validation failed", 400, errors)
         
         # Check for duplicate name
-        if Asset.query.filter_by(name=data['name']).first():
+        if Asset.query.filter_by(tenant=current_tenant(), name=data['name']).first():
             return error_response("Asset name already exists", 409)
         
         try:
             # Create asset
             asset = Asset(
+                tenant=current_tenant(),
                 name=data['name'],
                 service_time=datetime.fromisoformat(data['service_time']) if 'service_time' in data else None,
                 expiration_time=datetime.fromisoformat(data['expiration_time']) if 'expiration_time' in data else None,
-                last_serviced=datetime.fromisoformat(data['last_serviced']) if 'last_serviced' in data else None
+                last_serviced=datetime.fromisoformat(data['last_serviced']) if 'last_serviced' in data else None,
+                service_interval_minutes=data.get('service_interval_minutes'),
+                service_cron=data.get('service_cron')
             )
+            if asset.service_time is None:
+                asset.service_time = next_service_time(
+                    asset.service_interval_minutes, asset.service_cron, asset.last_serviced or datetime.utcnow()
+                )
             
             db.session.add(asset)
             db.session.commit()
+            invalidate_assets()
             return success_response(asset_schema.dump(asset), "Asset created", 201)
         
         except (TypeError, ValueError) as e:
@@ -116,6 +282,337 @@ class AssetResource(Resource):
             db.session.rollback()
             return error_response("Database error", 500, {"details": str(e)})
 
+class AssetBulkResource(Resource):
+    @swag_from({
+        'consumes': ['application/json', 'application/x-ndjson'],
+        'parameters': [
+            {
+                'name': 'body',
+                'in': 'body',
+                'required': True,
+                'schema': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'name': {'type': 'string'},
+                            'service_time': {'type': 'string', 'format': 'date-time'},
+                            'expiration_time': {'type': 'string', 'format': 'date-time'},
+                            'last_serviced': {'type': 'string', 'format': 'date-time'}
+                        },
+                        'required': ['name']
+                    }
+                }
+            },
+            {
+                'name': 'batch_size',
+                'in': 'query',
+                'type': 'integer',
+                'required': False,
+                'description': 'Rows validated and committed per chunk'
+            }
+        ],
+        'responses': {
+            200: {
+                'description': 'Assets upserted by name',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'data': {
+                            'type': 'object',
+                            'properties': {
+                                'created': {'type': 'integer'},
+                                'updated': {'type': 'integer'},
+                                'errors': {
+                                    'type': 'array',
+                                    'items': {
+                                        'type': 'object',
+                                        'properties': {
+                                            'index': {'type': 'integer'},
+                                            'errors': {'type': 'object'}
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            400: {
+                'description': 'Body is not a JSON array or NDJSON',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'}
+                    }
+                }
+            }
+        }
+    })
+    def post(self):
+        """Create or update many assets at once"""
+        batch_size = request.args.get('batch_size', current_app.config['BULK_BATCH_SIZE'], type=int)
+        if batch_size < 1:
+            return error_response("batch_size must be a positive integer", 400)
+
+        try:
+            records = parse_bulk_body(request)
+        except ValueError as e:
+            return error_response(str(e), 400)
+
+        try:
+            result = ingest_assets(records, batch_size)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return error_response("Database error", 500, {"details": str(e)})
+        return success_response(result, "Bulk ingest completed")
+
+    @swag_from({
+        'parameters': [
+            {
+                'name': 'body',
+                'in': 'body',
+                'required': True,
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'ids': {'type': 'array', 'items': {'type': 'integer'}},
+                        'filter': {'type': 'object', 'description': 'Same keys as the GET /assets filters'},
+                        'set': {
+                            'type': 'object',
+                            'properties': {
+                                'service_time': {'type': 'string', 'format': 'date-time'},
+                                'expiration_time': {'type': 'string', 'format': 'date-time'},
+                                'last_serviced': {'type': 'string', 'format': 'date-time'},
+                                'service_interval_minutes': {'type': 'integer'},
+                                'service_cron': {'type': 'string'}
+                            }
+                        }
+                    },
+                    'required': ['set']
+                }
+            }
+        ] + BULK_CHANGE_PARAMETERS,
+        'responses': {
+            200: {
+                'description': 'Assets updated',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'data': {
+                            'type': 'object',
+                            'properties': {
+                                'updated': {'type': 'integer'},
+                                'violations_resolved': {'type': 'integer'}
+                            }
+                        }
+                    }
+                }
+            },
+            400: {
+                'description': 'Invalid selection or values',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'errors': {'type': 'object'}
+                    }
+                }
+            }
+        }
+    })
+    def patch(self):
+        """Apply the same changes to many assets, selected by id or filter"""
+        body = request.get_json(silent=True)
+        try:
+            batch_size, atomic = parse_bulk_change_args(request.args)
+            selection = parse_selection(body, ASSET_FILTERS, apply_filters)
+            values = parse_patch_values(body.get('set'))
+        except ValueError as e:
+            return error_response("Invalid bulk update", 400, {"details": e.args[0]})
+
+        try:
+            result = patch_assets(selection, values, batch_size, atomic)
+            return success_response(result, "Assets updated")
+        except SQLAlchemyError as e:
+            return error_response("Database error", 500, {"details": str(e)})
+
+    @swag_from({
+        'parameters': [
+            {
+                'name': 'body',
+                'in': 'body',
+                'required': True,
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'ids': {'type': 'array', 'items': {'type': 'integer'}},
+                        'filter': {'type': 'object', 'description': 'Same keys as the GET /assets filters'}
+                    }
+                }
+            }
+        ] + BULK_CHANGE_PARAMETERS,
+        'responses': {
+            200: {
+                'description': 'Assets and their notifications and violations deleted',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'data': {
+                            'type': 'object',
+                            'properties': {
+                                'assets': {'type': 'integer'},
+                                'notifications': {'type': 'integer'},
+                                'violations': {'type': 'integer'}
+                            }
+                        }
+                    }
+                }
+            },
+            400: {
+                'description': 'Invalid selection',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'errors': {'type': 'object'}
+                    }
+                }
+            }
+        }
+    })
+    def delete(self):
+        """Delete many assets, selected by id or filter"""
+        try:
+            batch_size, atomic = parse_bulk_change_args(request.args)
+            selection = parse_selection(request.get_json(silent=True), ASSET_FILTERS, apply_filters)
+        except ValueError as e:
+            return error_response("Invalid bulk delete", 400, {"details": e.args[0]})
+
+        try:
+            result = delete_assets(selection, batch_size, atomic)
+            return success_response(result, "Assets deleted")
+        except SQLAlchemyError as e:
+            return error_response("Database error", 500, {"details": str(e)})
+
+class AssetDue(Resource):
+    @swag_from({
+        'parameters': [
+            {
+                'name': 'from',
+                'in': 'query',
+                'type': 'string',
+                'format': 'date-time',
+                'required': False,
+                'description': 'Start of the window (default now)'
+            },
+            {
+                'name': 'to',
+                'in': 'query',
+                'type': 'string',
+                'format': 'date-time',
+                'required': False,
+                'description': 'End of the window, exclusive (default 24 hours after from)'
+            },
+            {
+                'name': 'type',
+                'in': 'query',
+                'type': 'string',
+                'enum': list(DUE_COLUMNS),
+                'required': False,
+                'description': 'Deadline to look at; required when listing assets'
+            },
+            {
+                'name': 'bucket',
+                'in': 'query',
+                'type': 'string',
+                'enum': list(BUCKETS),
+                'required': False,
+                'description': 'Return counts per bucket instead of assets'
+            },
+            {
+                'name': 'cursor',
+                'in': 'query',
+                'type': 'string',
+                'required': False,
+                'description': 'next_cursor from the previous page of assets'
+            },
+            {
+                'name': 'limit',
+                'in': 'query',
+                'type': 'integer',
+                'required': False,
+                'description': 'Assets per page'
+            }
+        ],
+        'responses': {
+            200: {
+                'description': 'Assets due in the window, soonest first, or counts per bucket',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'data': {
+                            'type': 'array',
+                            'items': {
+                                'type': 'object',
+                                'description': 'An Asset, or {bucket, service, expiration} with bucket=...'
+                            }
+                        },
+                        'next_cursor': {'type': 'string'}
+                    }
+                }
+            },
+            400: {
+                'description': 'Invalid window, type or bucket',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'errors': {'type': 'object'}
+                    }
+                }
+            }
+        }
+    })
+    def get(self):
+        """Assets with a deadline in a time window, or deadline counts per hour/day"""
+        def build():
+            try:
+                start, end, types, bucket = parse_due_args(request.args)
+                if bucket:
+                    return success_response(due_buckets(db.session, current_tenant(), start, end, types, bucket))
+                cursor, limit = parse_due_cursor(request.args)
+                rows, next_cursor = due_assets(db.session, current_tenant(), start, end, types[0], cursor, limit)
+                return paginated_response(rows, next_cursor)
+            except ValueError as e:
+                return error_response("Invalid query parameters", 400, {"details": str(e)})
+            except SQLAlchemyError as e:
+                return error_response("Database error", 500, {"details": str(e)})
+
+        return response_cache.respond(
+            asset_due_key(request.args), build, current_app.config['DUE_CACHE_TTL_SECONDS']
+        )
+
 class AssetDetailResource(Resource):
     @swag_from({
         'parameters': [{
@@ -153,13 +650,16 @@ class AssetDetailResource(Resource):
     })
     def get(self, asset_id):
         """Get asset details"""
-        try:
-            asset = Asset.query.get(asset_id)
-            if not asset:
-                return error_response("Asset not found", 404)
-            return success_response(asset_schema.dump(asset))
-        except SQLAlchemyError as e:
-            return error_response("Database error", 500, {"details": str(e)})
+        def build():
+            try:
+                asset = Asset.query.filter_by(id=asset_id, tenant=current_tenant()).first()
+                if not asset:
+                    return error_response("Asset not found", 404)
+                return success_response(asset_schema.dump(asset))
+            except SQLAlchemyError as e:
+                return error_response("Database error", 500, {"details": str(e)})
+
+        return response_cache.respond(asset_key(asset_id), build)
 
     @swag_from({
         'parameters': [
@@ -180,7 +680,9 @@ class AssetDetailResource(Resource):
                         'name': {'type': 'string'},
                         'service_time': {'type': 'string', 'format': 'date-time'},
                         'expiration_time': {'type': 'string', 'format': 'date-time'},
-                        'last_serviced': {'type': 'string', 'format': 'date-time'}
+                        'last_serviced': {'type': 'string', 'format': 'date-time'},
+                        'service_interval_minutes': {'type': 'integer'},
+                        'service_cron': {'type': 'string'}
                     }
                 }
             }
@@ -226,7 +728,7 @@ class AssetDetailResource(Resource):
     def put(self, asset_id):
         """Update an asset"""
         try:
-            asset = Asset.query.get(asset_id)
+            asset = Asset.query.filter_by(id=asset_id, tenant=current_tenant()).first()
             if not asset:
                 return error_response("Asset not found", 404)
                 
@@ -240,7 +742,7 @@ class AssetDetailResource(Resource):
             # Update fields
             if 'name' in data:
                 # Check for duplicate name
-                if data['name'] != asset.name and Asset.query.filter_by(name=data['name']).first():
+                if data['name'] != asset.name and Asset.query.filter_by(tenant=asset.tenant, name=data['name']).first():
                     return error_response("Asset name already exists", 409)
                 asset.name = data['name']
                 
@@ -250,8 +752,30 @@ class AssetDetailResource(Resource):
                 asset.expiration_time = datetime.fromisoformat(data['expiration_time'])
             if 'last_serviced' in data:
                 asset.last_serviced = datetime.fromisoformat(data['last_serviced'])
+            # A schedule replaces the other kind; clearing one leaves the other alone
+            if 'service_interval_minutes' in data:
+                asset.service_interval_minutes = data['service_interval_minutes']
+                if data['service_interval_minutes']:
+                    asset.service_cron = None
+            if 'service_cron' in data:
+                asset.service_cron = data['service_cron']
+                if data['service_cron']:
+                    asset.service_interval_minutes = None
+
+            # Recurring assets get their next deadline from the latest service
+            schedule_changed = any(field in data for field in ('last_serviced', 'service_interval_minutes', 'service_cron'))
+            if schedule_changed and 'service_time' not in data:
+                next_due = next_service_time(
+                    asset.service_interval_minutes, asset.service_cron, asset.last_serviced or datetime.utcnow()
+                )
+                if next_due is not None:
+                    asset.service_time = next_due
+
+            if any(field in data for field in ('service_time', 'expiration_time', 'last_serviced')):
+                resolve_violations(db.session, datetime.utcnow(), [Asset.id == asset_id])
                 
             db.session.commit()
+            invalidate_assets([asset_id])
             return success_response(asset_schema.dump(asset), "Asset updated")
             
         except (TypeError, ValueError) as e:
@@ -296,12 +820,13 @@ class AssetDetailResource(Resource):
     def delete(self, asset_id):
         """Delete an asset"""
         try:
-            asset = Asset.query.get(asset_id)
+            asset = Asset.query.filter_by(id=asset_id, tenant=current_tenant()).first()
             if not asset:
                 return error_response("Asset not found", 404)
                 
-            db.session.delete(asset)
+            delete_asset_rows(db.session, [asset_id])
             db.session.commit()
+            invalidate_assets([asset_id])
             return success_response(None, "Asset deleted", 204)
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -322,7 +847,8 @@ class RunChecks(Resource):
                             'type': 'object',
                             'properties': {
                                 'notifications_created': {'type': 'integer'},
-                                'violations_created': {'type': 'integer'}
+                                'violations_created': {'type': 'integer'},
+                                'violations_resolved': {'type': 'integer'}
                             }
                         }
                     }
@@ -333,19 +859,21 @@ class RunChecks(Resource):
     def post(self):
         """Run periodic checks"""
         try:
-            result = run_checks()
+            result = run_checks(tenant=current_tenant())
             return success_response({
                 "notifications_created": result.get("notifications", 0),
-                "violations_created": result.get("violations", 0)
+                "violations_created": result.get("violations", 0),
+                "violations_resolved": result.get("resolved", 0)
             }, "Checks completed")
         except Exception as e:
             return error_response("Error running checks", 500, {"details": str(e)})
 
 class NotificationList(Resource):
     @swag_from({
+        'parameters': PAGINATION_PARAMETERS + filter_parameters(NOTIFICATION_FILTERS),
         'responses': {
             200: {
-                'description': 'List of all notifications',
+                'description': 'One page of notifications',
                 'schema': {
                     'type': 'object',
                     'properties': {
@@ -355,6 +883,62 @@ class NotificationList(Resource):
                         'data': {
                             'type': 'array',
                             'items': {'$ref': '#/definitions/Notification'}
+                        },
+                        'next_cursor': {'type': 'integer'}
+                    }
+                }
+            }
+        }
+    })
+    def get(self):
+        """List notifications, one page at a time"""
+        return list_page(Notification, NOTIFICATION_COLUMNS, NOTIFICATION_FILTERS)
+
+class ViolationList(Resource):
+    @swag_from({
+        'parameters': PAGINATION_PARAMETERS + filter_parameters(VIOLATION_FILTERS),
+        'responses': {
+            200: {
+                'description': 'One page of violations',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'data': {
+                            'type': 'array',
+                            'items': {'$ref': '#/definitions/Violation'}
+                        },
+                        'next_cursor': {'type': 'integer'}
+                    }
+                }
+            }
+        }
+    })
+    def get(self):
+        """List violations, one page at a time"""
+        return list_page(Violation, VIOLATION_COLUMNS, VIOLATION_FILTERS)
+
+class CacheStats(Resource):
+    @swag_from({
+        'responses': {
+            200: {
+                'description': 'Response cache counters',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'data': {
+                            'type': 'object',
+                            'properties': {
+                                'backend': {'type': 'string'},
+                                'entries': {'type': 'integer'},
+                                'hits': {'type': 'integer'},
+                                'misses': {'type': 'integer'}
+                            }
                         }
                     }
                 }
@@ -362,19 +946,125 @@ class NotificationList(Resource):
         }
     })
     def get(self):
-        """List all notifications"""
+        """Show response cache hit/miss counters"""
+        return success_response(response_cache.stats())
+
+FEED_PARAMETERS = [
+    {
+        'name': 'after',
+        'in': 'query',
+        'type': 'integer',
+        'required': False,
+        'description': 'Return feed entries with a seq greater than this (next_cursor of the previous response); defaults to the newest entry'
+    },
+    {
+        'name': 'limit',
+        'in': 'query',
+        'type': 'integer',
+        'required': False,
+        'description': 'Maximum number of entries per response'
+    }
+]
+
+class Events(Resource):
+    @swag_from({
+        'parameters': FEED_PARAMETERS + [{
+            'name': 'timeout',
+            'in': 'query',
+            'type': 'number',
+            'required': False,
+            'description': 'Seconds to wait for new entries when there are none yet (capped at FEED_LONG_POLL_SECONDS)'
+        }],
+        'responses': {
+            200: {
+                'description': 'New feed entries, possibly none if the timeout passed',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'data': {
+                            'type': 'array',
+                            'items': {
+                                'type': 'object',
+                                'properties': {
+                                    'seq': {'type': 'integer'},
+                                    'type': {'type': 'string', 'enum': ['notification', 'violation']},
+                                    'data': {'type': 'object'}
+                                }
+                            }
+                        },
+                        'next_cursor': {'type': 'integer'}
+                    }
+                }
+            },
+            410: {
+                'description': 'after is older than the retained feed; reload the lists and resume from oldest_seq',
+                'schema': {
+                    'type': 'object',
+                    'properties': {
+                        'status': {'type': 'string'},
+                        'code': {'type': 'integer'},
+                        'message': {'type': 'string'},
+                        'errors': {'type': 'object'}
+                    }
+                }
+            }
+        }
+    })
+    def get(self):
+        """Long-poll the change feed for new notifications and violations"""
+        tenant = current_tenant()
         try:
-            notifications = Notification.query.all()
-            data = notifications_schema.dump(notifications)
-            return success_response(data)
+            after, limit, timeout = parse_feed_args(request.args)
+            if after is None:
+                after = change_feed.newest(db.session, tenant)
+            else:
+                check_after(db.session, tenant, after)
+            change_feed.wait(db.session, tenant, after, timeout)
+            events, next_cursor = read_changes(db.session, tenant, after, limit)
+            return paginated_response(events, next_cursor)
+        except ValueError as e:
+            return error_response("Invalid query parameters", 400, {"details": str(e)})
+        except LookupError as e:
+            return error_response("Feed entries after this seq were pruned", 410, {"oldest_seq": e.args[0]})
         except SQLAlchemyError as e:
             return error_response("Database error", 500, {"details": str(e)})
 
-class ViolationList(Resource):
+class EventStream(Resource):
     @swag_from({
+        'parameters': FEED_PARAMETERS,
+        'produces': ['text/event-stream'],
         'responses': {
             200: {
-                'description': 'List of all violations',
+                'description': 'Server-Sent Events: one "notification" or "violation" event per feed entry, with seq as the event id'
+            }
+        }
+    })
+    def get(self):
+        """Stream the change feed as Server-Sent Events"""
+        try:
+            after, limit, _ = parse_feed_args(request.args, request.headers.get('Last-Event-ID'))
+        except ValueError as e:
+            return error_response("Invalid query parameters", 400, {"details": str(e)})
+
+        stream = sse_stream(db.session, current_tenant(), after, limit, current_app.config['FEED_HEARTBEAT_SECONDS'])
+        headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        return Response(stream_with_context(stream), mimetype='text/event-stream', headers=headers)
+
+class Stats(Resource):
+    @swag_from({
+        'parameters': [{
+            'name': 'days',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': 'Number of days of violation counts to return (default 30)'
+        }],
+        'responses': {
+            200: {
+                'description': 'Dashboard aggregates, as of the last full check run',
                 'schema': {
                     'type': 'object',
                     'properties': {
@@ -382,8 +1072,27 @@ class ViolationList(Resource):
                         'code': {'type': 'integer'},
                         'message': {'type': 'string'},
                         'data': {
-                            'type': 'array',
-                            'items': {'$ref': '#/definitions/Violation'}
+                            'type': 'object',
+                            'properties': {
+                                'assets_total': {'type': 'integer'},
+                                'assets_overdue_service': {'type': 'integer'},
+                                'assets_expired': {'type': 'integer'},
+                                'service_due_next_hour': {'type': 'integer'},
+                                'expiring_next_hour': {'type': 'integer'},
+                                'violations_open': {'type': 'integer'},
+                                'computed_at': {'type': 'string', 'format': 'date-time'},
+                                'violations_per_day': {
+                                    'type': 'array',
+                                    'items': {
+                                        'type': 'object',
+                                        'properties': {
+                                            'day': {'type': 'string', 'format': 'date'},
+                                            'service': {'type': 'integer'},
+                                            'expiration': {'type': 'integer'}
+                                        }
+                                    }
+                                }
+                            }
                         }
                     }
                 }
@@ -391,16 +1100,53 @@ class ViolationList(Resource):
         }
     })
     def get(self):
-        """List all violations"""
+        """Dashboard aggregates from materialized counters"""
+        days = request.args.get('days', 30, type=int)
+        if days < 1:
+            return error_response("days must be a positive integer", 400)
         try:
-            violations = Violation.query.all()
-            data = violations_schema.dump(violations)
-            return success_response(data)
+            return success_response(read_stats(db.session, days, current_tenant()))
         except SQLAlchemyError as e:
             return error_response("Database error", 500, {"details": str(e)})
 
+class NotificationExport(Resource):
+    @swag_from({
+        'parameters': EXPORT_PARAMETERS,
+        'produces': ['application/x-ndjson'],
+        'responses': {
+            200: {
+                'description': 'Notifications as newline-delimited JSON, one object per line'
+            }
+        }
+    })
+    def get(self):
+        """Stream all notifications as NDJSON"""
+        return export_response(Notification, NOTIFICATION_COLUMNS)
+
+class ViolationExport(Resource):
+    @swag_from({
+        'parameters': EXPORT_PARAMETERS,
+        'produces': ['application/x-ndjson'],
+        'responses': {
+            200: {
+                'description': 'Violations as newline-delimited JSON, one object per line'
+            }
+        }
+    })
+    def get(self):
+        """Stream all violations as NDJSON"""
+        return export_response(Violation, VIOLATION_COLUMNS)
+
 api.add_resource(AssetResource, '/assets')
+api.add_resource(AssetBulkResource, '/assets/bulk')
+api.add_resource(AssetDue, '/assets/due')
 api.add_resource(AssetDetailResource, '/assets/<int:asset_id>')
 api.add_resource(RunChecks, '/run-checks')
 api.add_resource(NotificationList, '/notifications')
-api.add_resource(ViolationList, '/violations')
\ No newline at end of file
+api.add_resource(ViolationList, '/violations')
+api.add_resource(NotificationExport, '/notifications/export')
+api.add_resource(ViolationExport, '/violations/export')
+api.add_resource(CacheStats, '/cache/stats')
+api.add_resource(Stats, '/stats')
+api.add_resource(Events, '/events')
+api.add_resource(EventStream, '/events/stream')
\ No newline at end of file
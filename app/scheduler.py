@@ -0,0 +1,241 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import or_, update
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.deadlines import deadline_queue
+from app.models import CheckLease
+from app.tenancy import tenant_names, tenant_scope
+from app.utils import insert_ignore, run_checks
+
+LEASE_NAME = 'run-checks'
+
+# How long due assets wait when their tenant's lease is held elsewhere
+DUE_RETRY_DELAY = timedelta(seconds=5)
+
+def acquire_lease(name, owner, seconds):
+    """Claim the named lease if it is free, expired or already ours"""
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=seconds)
+    try:
+        claimed = db.session.execute(
+            update(CheckLease)
+            .where(CheckLease.name == name, or_(CheckLease.expires_at < now, CheckLease.owner == owner))
+            .values(owner=owner, expires_at=expires_at)
+        ).rowcount
+        if not claimed:
+            claimed = insert_ignore(db.session, CheckLease, [{'name': name, 'owner': owner, 'expires_at': expires_at}])
+        db.session.commit()
+        return bool(claimed)
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+def release_lease(name, owner):
+    try:
+        db.session.execute(
+            update(CheckLease)
+            .where(CheckLease.name == name, CheckLease.owner == owner)
+            .values(expires_at=datetime.utcnow())
+        )
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+class CheckScheduler:
+    """Runs `run_checks` on a fixed interval in a background thread.
+
+    Every full run checks each tenant separately after claiming that tenant's
+    lease row, so when several nodes run the scheduler each tenant is scanned
+    by only one of them at a time.
+
+    With CHECK_MODE = 'incremental' the full scan only runs every
+    CHECK_RECONCILE_SECONDS; in between, a deadline queue wakes the scheduler
+    exactly when an asset enters the notification window or misses a deadline
+    and only those assets are checked. Writes made in other processes are
+    picked up by the next reconcile.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['check_scheduler'] = self
+        app.cli.add_command(run_checks_worker)
+        if app.config['CHECK_MODE'] == 'incremental':
+            deadline_queue.init_app(app)
+
+    def run_once(self):
+        """Run one check cycle for every tenant whose lease is free.
+
+        Tenants are checked separately, CHECK_TENANT_CONCURRENCY at a time and
+        each under a lease of its own, so a large tenant neither delays a small
+        one nor keeps another node from picking it up. Returns the run report,
+        or None when every tenant's lease was held elsewhere.
+        """
+        config = current_app.config
+        tenants = tenant_names(db.session)
+        db.session.commit()
+
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        app = current_app._get_current_object()
+        workers = max(1, min(config['CHECK_TENANT_CONCURRENCY'], len(tenants)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tenant-checks') as pool:
+            results = dict(zip(tenants, pool.map(lambda tenant: self.run_tenant(app, tenant), tenants)))
+
+        checked = {tenant: result for tenant, result in results.items() if result is not None}
+        if tenants and not checked:
+            current_app.logger.debug("Check leases held by other nodes, skipping run")
+            return None
+
+        self.last_run = {
+            "started_at": started_at.isoformat(),
+            "duration_seconds": round(time.perf_counter() - started, 3),
+            "notifications_created": sum(result["notifications"] for result in checked.values()),
+            "violations_created": sum(result["violations"] for result in checked.values()),
+            "violations_resolved": sum(result["resolved"] for result in checked.values()),
+            "tenants": {tenant: result and result["duration_seconds"] for tenant, result in results.items()}
+        }
+        current_app.logger.info(
+            "Checks completed for %d/%d tenants in %.3fs: %d notifications, %d violations, %d resolved",
+            len(checked),
+            len(tenants),
+            self.last_run["duration_seconds"],
+            self.last_run["notifications_created"],
+            self.last_run["violations_created"],
+            self.last_run["violations_resolved"]
+        )
+        return self.last_run
+
+    def run_tenant(self, app, tenant, asset_ids=None):
+        """Check one tenant in its own app context; None if its lease is held or the run failed.
+
+        With `asset_ids` only those of the tenant's assets are checked.
+        """
+        lease = f"{LEASE_NAME}:{tenant}"
+        with app.app_context(), tenant_scope(tenant):
+            config = current_app.config
+            try:
+                if not acquire_lease(lease, self.owner, config['CHECK_LEASE_SECONDS']):
+                    return None
+                started = time.perf_counter()
+                try:
+                    result = run_checks(asset_ids, tenant=tenant)
+                finally:
+                    release_lease(lease, self.owner)
+            except Exception:
+                current_app.logger.exception("Checks failed for tenant %s", tenant)
+                return None
+            return {**result, "duration_seconds": round(time.perf_counter() - started, 3)}
+
+    def run_due(self, due):
+        """Check only the assets whose deadlines just came due, given as {tenant: asset ids}.
+
+        Each tenant is checked in its own database under its own lease; assets
+        of a tenant whose lease is held elsewhere are queued again shortly.
+        """
+        app = current_app._get_current_object()
+        started = time.perf_counter()
+        result = {"notifications": 0, "violations": 0}
+        for tenant, asset_ids in due.items():
+            checked = self.run_tenant(app, tenant, list(asset_ids))
+            if checked is None:
+                deadline_queue.defer(tenant, asset_ids, datetime.utcnow() + DUE_RETRY_DELAY)
+                continue
+            for key in result:
+                result[key] += checked[key]
+        current_app.logger.info(
+            "Incremental checks for %d assets in %.3fs: %d notifications, %d violations",
+            sum(len(asset_ids) for asset_ids in due.values()),
+            time.perf_counter() - started,
+            result["notifications"],
+            result["violations"]
+        )
+        return result
+
+    def run_forever(self, interval=None):
+        """Run checks every `interval` seconds until `stop` is called"""
+        if self.app.config['CHECK_MODE'] == 'incremental':
+            return self.run_incremental()
+
+        interval = interval or self.app.config['CHECK_INTERVAL_SECONDS']
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    self.run_once()
+                except Exception:
+                    current_app.logger.exception("Scheduled checks failed")
+            self._stop.wait(interval)
+
+    def run_incremental(self):
+        """Fire checks at queued deadlines, with a full reconcile as safety net"""
+        reconcile_every = self.app.config['CHECK_RECONCILE_SECONDS']
+        next_reconcile = time.monotonic()
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    if time.monotonic() >= next_reconcile:
+                        next_reconcile = time.monotonic() + reconcile_every
+                        self.run_once()
+                        deadline_queue.rebuild(db.session, datetime.utcnow())
+                    else:
+                        due = deadline_queue.pop_due(datetime.utcnow())
+                        if due:
+                            self.run_due(due)
+                except Exception:
+                    current_app.logger.exception("Scheduled checks failed")
+
+            # Clear before reading the queue so a trigger pushed meanwhile still wakes us
+            deadline_queue.changed.clear()
+            timeout = next_reconcile - time.monotonic()
+            next_due = deadline_queue.next_due()
+            if next_due is not None:
+                timeout = min(timeout, (next_due - datetime.utcnow()).total_seconds())
+            deadline_queue.changed.wait(max(timeout, 0))
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name='check-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        deadline_queue.changed.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+@click.command('run-checks-worker')
+@click.option('--interval', type=int, default=None, help="Seconds between runs (defaults to CHECK_INTERVAL_SECONDS)")
+@click.option('--once', is_flag=True, help="Run a single check cycle and exit")
+@with_appcontext
+def run_checks_worker(interval, once):
+    """Run asset checks in the foreground on a fixed interval."""
+    scheduler = current_app.extensions['check_scheduler']
+    if once:
+        report = scheduler.run_once()
+        click.echo(report if report else "Check lease held by another node")
+        return
+
+    try:
+        scheduler.run_forever(interval)
+    except KeyboardInterrupt:
+        scheduler.stop()
@@ -0,0 +1,122 @@
+from datetime import datetime, time, timedelta
+from sqlalchemy import or_, select, update
+from app.cache import invalidate_assets
+from app.deadlines import deadline_queue
+from app.models import Asset
+
+CRON_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+    '@yearly': '0 0 1 1 *',
+}
+
+# (low, high) for minute, hour, day of month, month, day of week (0 = Sunday)
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# How far ahead next_cron looks before deciding a rule never matches (e.g. "0 0 31 2 *")
+CRON_SEARCH_DAYS = 366 * 5
+
+def parse_cron(expression):
+    """Parse a five-field cron rule into sets of allowed values.
+
+    Supports `*`, lists, ranges, steps and the @hourly/@daily/@weekly/
+    @monthly/@yearly aliases. Raises ValueError on anything else.
+    """
+    fields = CRON_ALIASES.get(expression.strip(), expression).split()
+    if len(fields) != 5:
+        raise ValueError("Cron rules need five fields: minute hour day month weekday")
+
+    parsed = [_parse_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELDS)]
+    # 7 is an alias for Sunday
+    parsed[4] = {value % 7 for value in parsed[4]}
+    # Standard cron: when both day fields are restricted, either may match
+    parsed.append((fields[2] != '*', fields[4] != '*'))
+    return parsed
+
+def next_cron(expression, after):
+    """First minute strictly after `after` matching the cron rule"""
+    minutes, hours, days, months, weekdays, (days_set, weekdays_set) = parse_cron(expression)
+    start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    day = start.date()
+    for _ in range(CRON_SEARCH_DAYS):
+        day_match = day.day in days
+        weekday_match = (day.weekday() + 1) % 7 in weekdays
+        matches = (day_match or weekday_match) if days_set and weekdays_set else (day_match and weekday_match)
+        if day.month in months and matches:
+            for hour in sorted(hours):
+                for minute in sorted(minutes):
+                    candidate = datetime.combine(day, time(hour, minute))
+                    if candidate >= start:
+                        return candidate
+        day += timedelta(days=1)
+    raise ValueError(f"Cron rule never matches: {expression}")
+
+def next_service_time(interval_minutes, cron, after):
+    """The deadline following a service at `after`, or None for one-off assets"""
+    if after is None:
+        return None
+    if interval_minutes:
+        return after + timedelta(minutes=interval_minutes)
+    if cron:
+        return next_cron(cron, after)
+    return None
+
+def advance_schedules(session, now, criteria=(), batch_size=1000):
+    """Move recurring assets that were serviced past their deadline to the next one.
+
+    Recurring assets keep their next deadline precomputed in the indexed
+    `service_time`, so checks only ever range-scan for it. PUT recomputes it
+    as soon as `last_serviced` changes; this catches everything written in
+    bulk. Rows are read and written `batch_size` at a time with one
+    executemany UPDATE each, and the cached responses of the advanced assets
+    are dropped. The caller owns the transaction. Returns the number of
+    assets advanced.
+    """
+    stmt = (
+        select(Asset.id, Asset.tenant, Asset.service_interval_minutes, Asset.service_cron, Asset.last_serviced)
+        .where(
+            or_(Asset.service_interval_minutes.is_not(None), Asset.service_cron.is_not(None)),
+            Asset.last_serviced.is_not(None),
+            or_(Asset.service_time.is_(None), Asset.last_serviced >= Asset.service_time),
+            *criteria
+        )
+        .order_by(Asset.id)
+        .limit(batch_size)
+    )
+
+    advanced = 0
+    after_id = 0
+    while True:
+        rows = session.execute(stmt.where(Asset.id > after_id)).all()
+        if not rows:
+            return advanced
+        changes = [
+            {'id': asset_id, 'service_time': next_service_time(interval, cron, last_serviced)}
+            for asset_id, _, interval, cron, last_serviced in rows
+        ]
+        session.execute(update(Asset), changes)
+        deadline_queue.track_many(
+            (row.tenant, change['id'], (change['service_time'],)) for row, change in zip(rows, changes)
+        )
+        for tenant in {row.tenant for row in rows}:
+            invalidate_assets([row.id for row in rows if row.tenant == tenant], tenant)
+        advanced += len(changes)
+        after_id = rows[-1].id
+
+def _parse_field(field, low, high):
+    values = set()
+    for part in field.split(','):
+        spec, _, step = part.partition('/')
+        if spec == '*':
+            first, last = low, high
+        elif '-' in spec:
+            first, last = (int(value) for value in spec.split('-', 1))
+        else:
+            first = last = int(spec)
+        step = int(step) if step else 1
+        if not (low <= first <= last <= high) or step < 1:
+            raise ValueError(f"Invalid cron field: {field}")
+        values.update(range(first, last + 1, step))
+    return values
@@ -1,26 +1,52 @@
-from marshmallow import Schema, fields, validate
+from datetime import datetime
+from marshmallow import Schema, ValidationError, fields, validate, validates, validates_schema
+from app.schedules import next_cron
 
 class AssetSchema(Schema):
     id = fields.Int(dump_only=True)
+    tenant = fields.Str(dump_only=True)
     name = fields.Str(required=True)
     service_time = fields.DateTime(allow_none=True)
     expiration_time = fields.DateTime(allow_none=True)
     last_serviced = fields.DateTime(allow_none=True)
+    service_interval_minutes = fields.Int(allow_none=True, validate=validate.Range(min=1))
+    service_cron = fields.Str(allow_none=True)
+
+    @validates('service_cron')
+    def validate_service_cron(self, value, **kwargs):
+        if value is not None:
+            try:
+                # Also rejects well-formed rules that never fire, such as "0 0 31 2 *"
+                next_cron(value, datetime.utcnow())
+            except ValueError as e:
+                raise ValidationError(str(e))
+
+    @validates_schema
+    def validate_schedule(self, data, **kwargs):
+        if data.get('service_interval_minutes') and data.get('service_cron'):
+            raise ValidationError("Use either service_interval_minutes or service_cron", 'service_cron')
 
 class NotificationSchema(Schema):
     id = fields.Int(dump_only=True)
+    tenant = fields.Str(dump_only=True)
     asset_id = fields.Int(required=True)
     message = fields.Str(required=True)
     event_type = fields.Str(required=True, validate=validate.OneOf(['service', 'expiration']))
     event_time = fields.DateTime(required=True)
     created_at = fields.DateTime(dump_only=True)
+    delivery_status = fields.Str(dump_only=True)
+    delivered_at = fields.DateTime(dump_only=True)
 
 class ViolationSchema(Schema):
     id = fields.Int(dump_only=True)
+    tenant = fields.Str(dump_only=True)
     asset_id = fields.Int(required=True)
     message = fields.Str(required=True)
     event_type = fields.Str(required=True, validate=validate.OneOf(['service', 'expiration']))
+    deadline = fields.DateTime(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
+    status = fields.Str(dump_only=True)
+    resolved_at = fields.DateTime(dump_only=True)
 
 asset_schema = AssetSchema()
 assets_schema = AssetSchema(many=True)
@@ -0,0 +1,131 @@
+from datetime import date, datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models import Asset, DailyViolationCount, StatCounter, Violation
+from app.tenancy import tenant_scope
+
+# Gauges recomputed per tenant by every full check run, as name -> (counted column, WHERE clause factory)
+GAUGES = {
+    'assets_total': (Asset.id, lambda now: []),
+    'assets_overdue_service': (Asset.id, lambda now: [
+        Asset.service_time < now,
+        or_(Asset.last_serviced.is_(None), Asset.last_serviced < Asset.service_time)
+    ]),
+    'assets_expired': (Asset.id, lambda now: [Asset.expiration_time < now]),
+    'service_due_next_hour': (Asset.id, lambda now: [Asset.service_time.between(now, now + timedelta(hours=1))]),
+    'expiring_next_hour': (Asset.id, lambda now: [Asset.expiration_time.between(now, now + timedelta(hours=1))]),
+    'violations_open': (Violation.id, lambda now: [Violation.status == 'open']),
+}
+
+def refresh_gauges(session, now, tenant=None):
+    """Recompute every gauge and store the results.
+
+    With a `tenant` each gauge is one indexed count over that tenant's rows;
+    without, one count grouped by tenant, and tenants that have dropped to
+    zero are stored as zero.
+    """
+    values = {}
+    for name, (column, criteria) in GAUGES.items():
+        tenant_column = column.table.c.tenant
+        if tenant is not None:
+            values[tenant, name] = session.execute(
+                select(func.count(column)).where(tenant_column == tenant, *criteria(now))
+            ).scalar_one()
+            continue
+        stmt = select(tenant_column, func.count(column)).where(*criteria(now)).group_by(tenant_column)
+        for row_tenant, value in session.execute(stmt):
+            values[row_tenant, name] = value
+
+    tenants = {tenant} if tenant is not None else {row_tenant for row_tenant, _ in values}
+    if tenant is None:
+        tenants.update(session.execute(select(StatCounter.tenant).distinct()).scalars())
+    rows = [
+        {'tenant': row_tenant, 'name': name, 'value': values.get((row_tenant, name), 0), 'updated_at': now}
+        for row_tenant in sorted(tenants) for name in GAUGES
+    ]
+    if rows:
+        _upsert(session, StatCounter, rows, ['tenant', 'name'])
+
+def record_violations(session, day, counts):
+    """Add newly created violations ((tenant, event_type) -> count) to the day's counters"""
+    rows = [
+        {'tenant': tenant, 'day': day, 'event_type': event_type, 'count': count}
+        for (tenant, event_type), count in counts.items() if count
+    ]
+    if rows:
+        _upsert(session, DailyViolationCount, rows, ['tenant', 'day', 'event_type'], increment='count')
+
+def rebuild_violation_counts(session):
+    """Recount DailyViolationCount from the Violation table, e.g. after an upgrade"""
+    day = func.date(Violation.created_at)
+    rows = session.execute(
+        select(Violation.tenant, day, Violation.event_type, func.count(Violation.id))
+        .group_by(Violation.tenant, day, Violation.event_type)
+    ).all()
+    session.execute(DailyViolationCount.__table__.delete())
+    if rows:
+        session.execute(insert(DailyViolationCount), [
+            {'tenant': tenant, 'day': _as_date(row_day), 'event_type': event_type, 'count': count}
+            for tenant, row_day, event_type, count in rows
+        ])
+
+def read_stats(session, days, tenant):
+    """Everything /stats serves for one tenant, read from the counter tables only"""
+    gauges = session.execute(
+        select(StatCounter.name, StatCounter.value, StatCounter.updated_at).where(StatCounter.tenant == tenant)
+    ).all()
+
+    per_day = {}
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    for day, event_type, count in session.execute(
+        select(DailyViolationCount.day, DailyViolationCount.event_type, DailyViolationCount.count)
+        .where(DailyViolationCount.tenant == tenant, DailyViolationCount.day >= since)
+        .order_by(DailyViolationCount.day)
+    ):
+        per_day.setdefault(day.isoformat(), {})[event_type] = count
+
+    return {
+        **{name: value for name, value, _ in gauges},
+        "computed_at": max((updated_at.isoformat() for _, _, updated_at in gauges), default=None),
+        "violations_per_day": [{"day": day, **counts} for day, counts in per_day.items()]
+    }
+
+@click.command('rebuild-stats')
+@with_appcontext
+def rebuild_stats():
+    """Recompute the /stats counters from the full tables of every database."""
+    for tenant in [None, *current_app.config['TENANT_DATABASES']]:
+        with tenant_scope(tenant):
+            rebuild_violation_counts(db.session)
+            refresh_gauges(db.session, datetime.utcnow())
+            db.session.commit()
+    click.echo("Stats rebuilt")
+
+def _upsert(session, model, rows, keys, increment=None):
+    """Insert rows; on a key conflict overwrite the other columns, or add to `increment`"""
+    columns = [column for column in rows[0] if column not in keys]
+    dialect = session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        stmt = (postgresql if dialect == 'postgresql' else sqlite).insert(model)
+        changes = {column: stmt.excluded[column] for column in columns}
+        if increment:
+            changes[increment] = getattr(model, increment) + stmt.excluded[increment]
+        session.execute(stmt.on_conflict_do_update(index_elements=keys, set_=changes), rows)
+        return
+
+    # Portable fallback: update existing keys, insert the rest
+    for row in rows:
+        values = {column: row[column] for column in columns}
+        if increment:
+            values[increment] = getattr(model, increment) + row[increment]
+        criteria = [getattr(model, key) == row[key] for key in keys]
+        if not session.execute(update(model).where(*criteria).values(**values)).rowcount:
+            session.execute(insert(model), [row])
+
+def _as_date(value):
+    # func.date() comes back as a string on SQLite
+    return date.fromisoformat(value) if isinstance(value, str) else value
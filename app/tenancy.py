@@ -0,0 +1,99 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from flask_sqlalchemy.session import Session
+
+DEFAULT_TENANT = 'default'
+TENANT_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,50}')
+
+_tenant = ContextVar('tenant', default=None)
+
+def tenant_databases(value):
+    """Parse "acme=sqlite:///acme.db,globex=postgresql://..." into {tenant: url}"""
+    databases = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        tenant, url = item.split('=', 1)
+        tenant = tenant.strip()
+        if not TENANT_PATTERN.fullmatch(tenant) or tenant == DEFAULT_TENANT:
+            raise ValueError(f"Invalid tenant name: {tenant}")
+        databases[tenant] = url.strip()
+    return databases
+
+def bind_key(tenant):
+    return f"tenant:{tenant}"
+
+def parse_tenant(value):
+    """Validate a tenant name from a request, falling back to the default tenant"""
+    if value is None or value == '':
+        return DEFAULT_TENANT
+    if not TENANT_PATTERN.fullmatch(value):
+        raise ValueError("Tenant must be 1-50 letters, digits, '-' or '_'")
+    return value
+
+def current_tenant():
+    """The tenant of the request or check run in progress"""
+    tenant = _tenant.get()
+    return DEFAULT_TENANT if tenant is None else tenant
+
+def set_tenant(tenant):
+    """Make `tenant` current; returns a token for `reset_tenant`"""
+    return _tenant.set(tenant)
+
+def reset_tenant(token):
+    _tenant.reset(token)
+
+@contextmanager
+def tenant_scope(tenant):
+    """Run the block as `tenant`: queries are routed to its database, if it has one"""
+    token = set_tenant(tenant)
+    try:
+        yield tenant
+    finally:
+        reset_tenant(token)
+
+class TenantSession(Session):
+    """Session that sends every statement to the current tenant's own database.
+
+    Tenants listed in TENANT_DATABASES are registered as binds named
+    "tenant:<name>"; everyone else shares the default database.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            engine = self._db.engines.get(bind_key(current_tenant()))
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def init_app(app):
+    """Register a bind for every tenant in TENANT_DATABASES; call before db.init_app"""
+    from app.config import engine_options
+
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    for tenant, url in app.config['TENANT_DATABASES'].items():
+        binds[bind_key(tenant)] = {'url': url, **engine_options(url)}
+    app.config['SQLALCHEMY_BINDS'] = binds
+    app.cli.add_command(init_tenant_databases)
+
+def tenant_names(session):
+    """Every tenant with assets or gauges in the default database plus every routed tenant"""
+    from sqlalchemy import select, union
+    from app.models import Asset, StatCounter
+
+    routed = current_app.config['TENANT_DATABASES']
+    with tenant_scope(DEFAULT_TENANT):
+        shared = session.execute(union(select(Asset.tenant), select(StatCounter.tenant))).scalars().all()
+    return sorted(set(shared) - set(routed)) + sorted(routed)
+
+@click.command('init-tenant-dbs')
+@with_appcontext
+def init_tenant_databases():
+    """Create the tables in every database listed in TENANT_DATABASES."""
+    from app import db
+
+    for tenant in current_app.config['TENANT_DATABASES']:
+        db.metadata.create_all(db.engines[bind_key(tenant)])
+        click.echo(f"Created tables for tenant {tenant}")
@@ -1,93 +1,201 @@
+import time
 from datetime import datetime, timedelta
+from flask import current_app
 from app import db
 from app.models import Asset, Notification, Violation
+from app.feed import change_feed, record_changes
+from app.instrumentation import record_check
+from app.schedules import advance_schedules
+from app.stats import record_violations, refresh_gauges
+from app.tenancy import tenant_scope
+from sqlalchemy import and_, exists, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
 
-def run_checks():
+NOTIFICATION_MESSAGES = {
+    'service': "Service due at {}",
+    'expiration': "Expires at {}",
+}
+
+VIOLATION_MESSAGES = {
+    'service': "Service overdue since {}",
+    'expiration': "Expired at {}",
+}
+
+def run_checks(asset_ids=None, tenant=None):
+    """Create notifications for upcoming deadlines and violations for missed ones.
+
+    Pass `asset_ids` to evaluate only those assets instead of the whole table,
+    and `tenant` to evaluate only that tenant's assets, in its own database if
+    it has one. Full scans are spread over CHECK_SHARDS worker processes when
+    it is above 1 and refresh the gauges served by /stats.
+    """
+    if tenant is not None:
+        with tenant_scope(tenant):
+            return _run_checks(asset_ids, [Asset.tenant == tenant], tenant)
+    return _run_checks(asset_ids, [], None)
+
+def _run_checks(asset_ids, criteria, tenant):
     now = datetime.utcnow()
-    upcoming = now + timedelta(minutes=15)
-    notifications = []
-    violations = []
-
-    assets = Asset.query.all()
-
-    for asset in assets:
-        if asset.service_time:
-            if now <= asset.service_time <= upcoming:
-                add_notification(
-                    asset,
-                    'service',
-                    asset.service_time,
-                    f"Service due at {asset.service_time}",
-                    notifications
-                )
-            
-            if now > asset.service_time and (
-                asset.last_serviced is None or 
-                asset.last_serviced < asset.service_time
-            ):
-                add_violation(
-                    asset,
-                    'service',
-                    f"Service overdue since {asset.service_time}",
-                    violations
-                )
-
-        if asset.expiration_time:
-            if now <= asset.expiration_time <= upcoming:
-                add_notification(
-                    asset,
-                    'expiration',
-                    asset.expiration_time,
-                    f"Expires at {asset.expiration_time}",
-                    notifications
-                )
-            
-            if now > asset.expiration_time:
-                add_violation(
-                    asset,
-                    'expiration',
-                    f"Expired at {asset.expiration_time}",
-                    violations
-                )
-
-    if notifications:
-        db.session.add_all(notifications)
-    if violations:
-        db.session.add_all(violations)
-    
+    upcoming = now + timedelta(minutes=current_app.config['CHECK_UPCOMING_MINUTES'])
+    keep = current_app.config['FEED_KEEP_EVENTS']
+    if asset_ids is not None:
+        criteria = [*criteria, Asset.id.in_(asset_ids)]
+    started = time.perf_counter()
+
     try:
+        if asset_ids is None and current_app.config['CHECK_SHARDS'] > 1:
+            from app.parallel import run_checks_parallel
+            result = run_checks_parallel(now, upcoming, current_app.config['CHECK_SHARDS'], tenant, keep)
+        else:
+            result = check_assets(db.session, now, upcoming, criteria, keep)
+
+        # Time-dependent gauges only change meaningfully on full scans
+        if asset_ids is None:
+            refresh_gauges(db.session, now, tenant)
         db.session.commit()
-        return {
-            "notifications": len(notifications),
-            "violations": len(violations)
-        }
+        change_feed.publish()
+        record_check(result, time.perf_counter() - started)
+        return result
     except SQLAlchemyError as e:
         db.session.rollback()
         raise e
 
-def add_notification(asset, event_type, event_time, message, collection):
-    if not Notification.query.filter_by(
-        asset_id=asset.id,
-        event_type=event_type,
-        event_time=event_time
-    ).first():
-        notification = Notification(
-            asset_id=asset.id,
-            message=message,
-            event_type=event_type,
-            event_time=event_time
-        )
-        collection.append(notification)
-
-def add_violation(asset, event_type, message, collection):
-    if not Violation.query.filter_by(
-        asset_id=asset.id,
-        event_type=event_type
-    ).first():
-        violation = Violation(
-            asset_id=asset.id,
-            message=message,
-            event_type=event_type
-        )
-        collection.append(violation)
\ No newline at end of file
+def check_assets(session, now, upcoming, criteria=(), keep=100000):
+    """Evaluate all assets in a handful of set-based statements.
+
+    Due and overdue assets are selected with range predicates, events that were
+    already recorded are dropped with an anti-join and the remaining rows are
+    written with bulk inserts. The unique dedup indexes make the
+    insert itself idempotent, so concurrent runs cannot create duplicates.
+    Recurring schedules serviced since their deadline are advanced first, then
+    open violations whose deadline was met or moved are resolved.
+    The daily violation counters are incremented and the new rows appended
+    to the change feed in the same transaction, which keeps its newest `keep`
+    entries per tenant.
+    `criteria` are extra WHERE clauses on Asset that narrow the scan.
+    The caller owns the transaction.
+    """
+    notifications = []
+    violations = {}
+
+    advance_schedules(session, now, criteria)
+    resolved = resolve_violations(session, now, criteria)
+    for event_type, column in _deadline_columns():
+        notifications.extend(_due_notifications(session, event_type, column, now, upcoming, criteria))
+        for tenant, rows in _by_tenant(_overdue_violations(session, event_type, column, now, criteria)).items():
+            violations[tenant, event_type] = insert_ignore(session, Violation, rows)
+
+    record_violations(session, now.date(), violations)
+    created = insert_ignore(session, Notification, notifications)
+    record_changes(session, now, criteria, keep)
+    return {
+        "notifications": created,
+        "violations": sum(violations.values()),
+        "resolved": resolved
+    }
+
+def resolve_violations(session, now, criteria=()):
+    """Resolve the open violations of assets that no longer miss that deadline.
+
+    A service violation closes once `last_serviced` reaches the deadline, and
+    either kind closes when its deadline is rescheduled or cleared; a newly
+    missed deadline then gets a violation of its own. Only the open set is
+    read, through its partial index. `criteria` narrow the assets as in
+    `check_assets`. Returns the number of violations resolved.
+    """
+    resolved = 0
+    for event_type, column in _deadline_columns():
+        still_missed = [column.is_not(None), Violation.deadline.is_not(None), column == Violation.deadline, column < now]
+        if event_type == 'service':
+            still_missed.append(or_(Asset.last_serviced.is_(None), Asset.last_serviced < column))
+        settled = exists().where(Asset.id == Violation.asset_id, ~and_(*still_missed), *criteria)
+        resolved += session.execute(
+            update(Violation)
+            .where(Violation.status == 'open', Violation.event_type == event_type, settled)
+            .values(status='resolved', resolved_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    return resolved
+
+def insert_ignore(session, model, rows):
+    """Bulk insert rows, skipping any that collide with a unique index.
+
+    Returns the number of rows actually inserted.
+    """
+    if not rows:
+        return 0
+
+    dialect = session.get_bind().dialect
+    if dialect.name == 'postgresql':
+        stmt = postgresql.insert(model).on_conflict_do_nothing()
+    elif dialect.name == 'sqlite':
+        stmt = sqlite.insert(model).on_conflict_do_nothing()
+    elif dialect.name in ('mysql', 'mariadb'):
+        stmt = insert(model).prefix_with('IGNORE')
+    else:
+        stmt = insert(model)
+
+    if dialect.insert_executemany_returning:
+        primary_key = model.__table__.primary_key.columns
+        return len(session.execute(stmt.returning(*primary_key), rows).all())
+    return session.execute(stmt, rows).rowcount
+
+def _by_tenant(rows):
+    # Daily violation counters are kept per tenant
+    groups = {}
+    for row in rows:
+        groups.setdefault(row['tenant'], []).append(row)
+    return groups
+
+def _deadline_columns():
+    return (
+        ('service', Asset.service_time),
+        ('expiration', Asset.expiration_time),
+    )
+
+def _due_notifications(session, event_type, column, now, upcoming, criteria):
+    already_notified = exists().where(
+        Notification.asset_id == Asset.id,
+        Notification.event_type == event_type,
+        Notification.event_time == column
+    )
+    rows = session.execute(
+        select(Asset.id, Asset.tenant, column).where(column.between(now, upcoming), ~already_notified, *criteria)
+    )
+    template = NOTIFICATION_MESSAGES[event_type]
+    return [
+        {
+            'asset_id': asset_id,
+            'tenant': tenant,
+            'message': template.format(event_time),
+            'created_at': now,
+            'event_type': event_type,
+            'event_time': event_time
+        }
+        for asset_id, tenant, event_time in rows
+    ]
+
+def _overdue_violations(session, event_type, column, now, criteria):
+    already_violated = exists().where(
+        Violation.asset_id == Asset.id,
+        Violation.event_type == event_type,
+        Violation.deadline == column
+    )
+    conditions = [column < now, ~already_violated, *criteria]
+    if event_type == 'service':
+        conditions.append(or_(Asset.last_serviced.is_(None), Asset.last_serviced < column))
+
+    rows = session.execute(select(Asset.id, Asset.tenant, column).where(*conditions))
+    template = VIOLATION_MESSAGES[event_type]
+    return [
+        {
+            'asset_id': asset_id,
+            'tenant': tenant,
+            'message': template.format(deadline),
+            'created_at': now,
+            'event_type': event_type,
+            'deadline': deadline
+        }
+        for asset_id, tenant, deadline in rows
+    ]
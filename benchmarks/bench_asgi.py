@@ -0,0 +1,142 @@
+"""Concurrent polling clients against the WSGI and the ASGI server.
+
+    python benchmarks/bench_asgi.py --assets 10000 --clients 64 --seconds 10
+
+Both servers run as subprocesses against the same seeded SQLite file: the
+threaded Werkzeug server for WSGI and uvicorn (one worker) for ASGI. Every
+client keeps one connection open and cycles through the four async read
+endpoints. The response cache is off so each request reaches the database.
+Needs the uvicorn, asgiref, aiosqlite and greenlet packages.
+"""
+import argparse
+import http.client
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+PATHS = ('/assets?limit=50', '/assets/{id}', '/notifications?limit=50', '/violations?limit=50')
+
+
+def serve(kind, port):
+    from common import make_app
+    if kind == 'wsgi':
+        from werkzeug.serving import run_simple
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        run_simple('127.0.0.1', port, make_app(os.environ['BENCH_DB'], reset=False), threaded=True)
+    else:
+        import uvicorn
+        from app.asgi import AsyncReadApp
+        uvicorn.run(AsyncReadApp(make_app(os.environ['BENCH_DB'], reset=False)), host='127.0.0.1', port=port,
+                    log_level='warning', access_log=False)
+
+
+def client(port, asset_count, stop, results, lock, offset):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies = []
+    errors = 0
+    position = offset
+    while not stop.is_set():
+        path = PATHS[position % len(PATHS)].format(id=position % asset_count + 1)
+        position += 1
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+    with lock:
+        results['latencies'].extend(latencies)
+        results['errors'] += errors
+
+
+def load(port, args):
+    results = {'latencies': [], 'errors': 0}
+    stop = threading.Event()
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=client, args=(port, args.assets, stop, results, lock, offset))
+        for offset in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(results['latencies'])
+    return {
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2) if latencies else None,
+        'errors': results['errors'],
+    }
+
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/assets?limit=1')
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--assets', type=int, default=10000)
+    parser.add_argument('--events', type=int, default=50000, help="notifications and violations each")
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--servers', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    parser.add_argument('--serve', choices=['wsgi', 'asgi'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, default=5100)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    from common import make_app, seed_assets, seed_events
+    os.environ['CACHE_BACKEND'] = 'none'
+    app = make_app()
+    path = app.config['SQLALCHEMY_DATABASE_URI'].split('///', 1)[1]
+    seed_assets(app, args.assets)
+    seed_events(app, args.events, args.events)
+
+    env = dict(os.environ, BENCH_DB=path, CACHE_BACKEND='none')
+    for offset, kind in enumerate(args.servers):
+        port = args.port + offset
+        server = subprocess.Popen(
+            [sys.executable, __file__, '--serve', kind, '--port', str(port)],
+            env=env, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        try:
+            wait_for(port)
+            result = load(port, args)
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{kind:<5} {args.clients} clients  {result['requests_per_second']:>9.1f} req/s  "
+              f"p50 {result['p50_ms']}ms  p99 {result['p99_ms']}ms  {result['errors']} errors")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Measure POST /assets/bulk ingest throughput against one POST /assets per row.
+
+    python benchmarks/bench_bulk_ingest.py --rows 50000 --batch-sizes 500 1000 5000
+"""
+import argparse
+import json
+
+from common import asset_rows, make_app, timed
+
+
+def payload(count):
+    rows = asset_rows(count)
+    for row in rows:
+        for field in ('service_time', 'expiration_time', 'last_serviced'):
+            if row[field] is None:
+                del row[field]
+            else:
+                row[field] = row[field].isoformat()
+    return rows
+
+
+def post_one_by_one(client, rows):
+    for row in rows:
+        client.post('/assets', json=row)
+
+
+def post_bulk(client, rows, batch_size, ndjson):
+    if ndjson:
+        body = "\n".join(json.dumps(row) for row in rows)
+        response = client.post(f'/assets/bulk?batch_size={batch_size}', data=body, content_type='application/x-ndjson')
+    else:
+        response = client.post(f'/assets/bulk?batch_size={batch_size}', json=rows)
+    data = response.get_json()['data']
+    if data['errors']:
+        raise SystemExit(f"unexpected row errors: {data['errors'][:5]}")
+    return data
+
+
+def report(label, count, elapsed):
+    print(f"{label:<28} {count:>8} rows  {elapsed:8.3f}s  {count / elapsed:>10.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[500, 1000, 5000])
+    parser.add_argument('--single-rows', type=int, default=2000, help="rows for the one-by-one baseline")
+    parser.add_argument('--ndjson', action='store_true', help="send the bulk body as NDJSON")
+    args = parser.parse_args()
+
+    rows = payload(args.rows)
+
+    app = make_app()
+    baseline = rows[:args.single_rows]
+    _, elapsed = timed(post_one_by_one, app.test_client(), baseline)
+    report("POST /assets (one by one)", len(baseline), elapsed)
+
+    for batch_size in args.batch_sizes:
+        app = make_app()
+        _, elapsed = timed(post_bulk, app.test_client(), rows, batch_size, args.ndjson)
+        report(f"POST /assets/bulk ({batch_size})", len(rows), elapsed)
+
+        # Re-sending the same rows exercises the update side of the upsert
+        _, elapsed = timed(post_bulk, app.test_client(), rows, batch_size, args.ndjson)
+        report(f"  re-upsert ({batch_size})", len(rows), elapsed)
+
+
+if __name__ == '__main__':
+    main()
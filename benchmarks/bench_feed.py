@@ -0,0 +1,131 @@
+"""Push latency of the change feed to waiting long-poll clients.
+
+    python benchmarks/bench_feed.py --history 200000 --clients 32 --rounds 20
+
+The threaded Werkzeug server runs in this process against a SQLite file whose
+feed already holds `--history` entries. Every client long-polls GET /events
+with the cursor of its previous response. Each round adds a few overdue
+assets and runs the checks; latency is measured from the moment the run
+publishes its commit to the moment a client has read the new entries.
+"""
+import argparse
+import http.client
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from common import make_app, seed_events
+
+
+def seed_feed(app, count, chunk_size=50000):
+    from sqlalchemy import insert, select
+    from app import db
+    from app.models import ChangeEvent, FeedSequence, Violation
+
+    now = datetime.utcnow()
+    with app.app_context():
+        ids = db.session.execute(select(Violation.id).order_by(Violation.id).limit(count)).scalars().all()
+        rows = [
+            {'tenant': 'default', 'seq': seq, 'kind': 'violation', 'record_id': record_id, 'created_at': now}
+            for seq, record_id in enumerate(ids, 1)
+        ]
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(insert(ChangeEvent), rows[start:start + chunk_size])
+        db.session.execute(insert(FeedSequence), [{'tenant': 'default', 'value': len(rows)}])
+        db.session.commit()
+        return len(rows)
+
+
+def client(port, after, stop, received, lock):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    while not stop.is_set():
+        connection.request('GET', f"/events?after={after}&timeout=2&limit=1000")
+        body = json.loads(connection.getresponse().read())
+        seen = time.perf_counter()
+        if body['data']:
+            with lock:
+                for event in body['data']:
+                    received.setdefault(event['seq'], []).append(seen)
+        after = body['next_cursor']
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--history', type=int, default=200000, help="feed entries already stored")
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--assets-per-round', type=int, default=5)
+    parser.add_argument('--port', type=int, default=5200)
+    args = parser.parse_args()
+
+    from werkzeug.serving import make_server
+    from app import db
+    from app.feed import change_feed
+    from sqlalchemy import func, select
+    from app.models import Asset, ChangeEvent
+    from app.utils import run_checks
+
+    app = make_app()
+    app.config['FEED_KEEP_EVENTS'] = 0
+    seed_events(app, 0, args.history)
+    newest = seed_feed(app, args.history)
+
+    published = {}
+    original_publish = change_feed.publish
+
+    def publish():
+        # Runs inside run_checks, right after its commit
+        published[db.session.execute(select(func.max(ChangeEvent.seq)).where(ChangeEvent.tenant == 'default')).scalar()] = time.perf_counter()
+        original_publish()
+    change_feed.publish = publish
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', args.port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    received = {}
+    clients = [
+        threading.Thread(target=client, args=(args.port, newest, stop, received, lock))
+        for _ in range(args.clients)
+    ]
+    for thread in clients:
+        thread.start()
+    time.sleep(1)
+
+    past = datetime.utcnow() - timedelta(hours=1)
+    with app.app_context():
+        for round_number in range(args.rounds):
+            db.session.add_all(
+                Asset(name=f"feed-{round_number}-{i}", service_time=past) for i in range(args.assets_per_round)
+            )
+            db.session.commit()
+            run_checks()
+            time.sleep(0.2)
+
+    time.sleep(1)
+    stop.set()
+    for thread in clients:
+        thread.join()
+    server.shutdown()
+
+    # Every entry of a run is published together; match each to its run's publish time
+    moments = sorted(published.items())
+    latencies = []
+    for seq, seen in received.items():
+        at = next(at for last, at in moments if last >= seq)
+        latencies.extend(moment - at for moment in seen)
+    latencies.sort()
+    expected = args.rounds * args.assets_per_round * args.clients
+    print(f"history {args.history}  clients {args.clients}  deliveries {len(latencies)}/{expected}")
+    if latencies:
+        print(f"latency p50 {latencies[len(latencies) // 2] * 1000:.1f}ms  "
+              f"p99 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000:.1f}ms  "
+              f"max {latencies[-1] * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
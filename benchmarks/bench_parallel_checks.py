@@ -0,0 +1,61 @@
+"""Measure how the sharded run_checks scan scales from 1 to N worker processes.
+
+    python benchmarks/bench_parallel_checks.py --assets 1000000 --shards 1 2 4 8
+"""
+import argparse
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from common import make_app, seed_assets, timed
+
+
+def copy_database(source, target):
+    """Copy a SQLite file including pages still in its WAL, which a file copy would miss"""
+    src, dst = sqlite3.connect(source), sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+
+
+def run(path, shards, now, upcoming):
+    from app import db
+    from app.parallel import run_checks_parallel
+    from app.utils import check_assets
+
+    app = make_app(path, reset=False)
+    with app.app_context():
+        if shards == 1:
+            result, elapsed = timed(check_assets, db.session, now, upcoming)
+            db.session.commit()
+        else:
+            result, elapsed = timed(run_checks_parallel, now, upcoming, shards)
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--assets', type=int, default=200000)
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    seeded = tempfile.mkstemp(suffix='.db', prefix='bench-seed-')[1]
+    seed_assets(make_app(seeded), args.assets)
+    now = datetime.utcnow()
+    upcoming = now + timedelta(minutes=15)
+
+    serial = None
+    for shards in args.shards:
+        path = tempfile.mkstemp(suffix='.db', prefix='bench-')[1]
+        copy_database(seeded, path)
+        result, elapsed = run(path, shards, now, upcoming)
+        serial = serial or result
+        print(f"{args.assets:>9} assets  {shards:>2} shard(s)  {elapsed:8.3f}s  {result}")
+        if result != serial:
+            raise SystemExit(f"shard results differ from the first run: {result} != {serial}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Compare the set-based run_checks engine with the original per-asset loop.
+
+    python benchmarks/bench_run_checks.py --sizes 1000 10000 100000
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from common import make_app, seed_assets, timed
+
+
+def run_checks_loop():
+    """The original implementation: one dedup query per asset and event type"""
+    from app import db
+    from app.models import Asset, Notification, Violation
+
+    now = datetime.utcnow()
+    upcoming = now + timedelta(minutes=15)
+    notifications = []
+    violations = []
+
+    def add_notification(asset, event_type, event_time, message):
+        if not Notification.query.filter_by(asset_id=asset.id, event_type=event_type, event_time=event_time).first():
+            notifications.append(Notification(asset_id=asset.id, message=message, event_type=event_type, event_time=event_time))
+
+    def add_violation(asset, event_type, message):
+        if not Violation.query.filter_by(asset_id=asset.id, event_type=event_type).first():
+            violations.append(Violation(asset_id=asset.id, message=message, event_type=event_type))
+
+    for asset in Asset.query.all():
+        if asset.service_time:
+            if now <= asset.service_time <= upcoming:
+                add_notification(asset, 'service', asset.service_time, f"Service due at {asset.service_time}")
+            if now > asset.service_time and (asset.last_serviced is None or asset.last_serviced < asset.service_time):
+                add_violation(asset, 'service', f"Service overdue since {asset.service_time}")
+        if asset.expiration_time:
+            if now <= asset.expiration_time <= upcoming:
+                add_notification(asset, 'expiration', asset.expiration_time, f"Expires at {asset.expiration_time}")
+            if now > asset.expiration_time:
+                add_violation(asset, 'expiration', f"Expired at {asset.expiration_time}")
+
+    db.session.add_all(notifications)
+    db.session.add_all(violations)
+    db.session.commit()
+    return {"notifications": len(notifications), "violations": len(violations)}
+
+
+def bench(size, skip_loop):
+    from app import db
+    from app.models import Notification, Violation
+    from app.utils import run_checks
+
+    results = {}
+    engines = [('set-based', run_checks)]
+    if not skip_loop:
+        engines.insert(0, ('loop', run_checks_loop))
+
+    for label, engine in engines:
+        app = make_app()
+        seed_assets(app, size)
+        with app.app_context():
+            first, elapsed = timed(engine)
+            _, rerun = timed(engine)
+            Notification.query.delete()
+            Violation.query.delete()
+            db.session.commit()
+        results[label] = first
+        print(f"{size:>8} assets  {label:<10} first run {elapsed:8.3f}s  re-run {rerun:8.3f}s  {first}")
+
+    # The loop engine has no resolution pass, so only the created rows are compared
+    compared = ('notifications', 'violations')
+    if len(results) == 2 and any(results['loop'][key] != results['set-based'][key] for key in compared):
+        raise SystemExit(f"engines disagree: {results}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--skip-loop', action='store_true', help="only time the set-based engine")
+    args = parser.parse_args()
+    for size in args.sizes:
+        bench(size, args.skip_loop)
+
+
+if __name__ == '__main__':
+    main()
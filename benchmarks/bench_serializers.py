@@ -0,0 +1,55 @@
+"""Compare the column-tuple fast path with marshmallow for list responses.
+
+    python benchmarks/bench_serializers.py --sizes 10000 100000
+"""
+import argparse
+
+from common import make_app, seed_assets, timed
+
+
+def marshmallow_body(limit):
+    from flask_restful.representations.json import output_json
+    from app.models import Asset
+    from app.response_model import paginated_response
+    from app.schemas import assets_schema
+
+    assets = Asset.query.order_by(Asset.id).limit(limit).all()
+    payload, status = paginated_response(assets_schema.dump(assets), None)
+    return output_json(payload, status).get_data()
+
+
+def fast_body(limit):
+    from app import db
+    from app.models import Asset
+    from app.response_model import paginated_response
+    from app.serializers import ASSET_COLUMNS, RowSerializer, output_json
+
+    rows = db.session.query(*ASSET_COLUMNS).order_by(Asset.id).limit(limit).all()
+    payload, status = paginated_response(RowSerializer(ASSET_COLUMNS).many(rows), None)
+    return output_json(payload, status).get_data()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed_assets(app, max(args.sizes))
+
+    for size in args.sizes:
+        for encoder in ('json', 'orjson'):
+            app.config['FAST_JSON_ENCODER'] = encoder
+            with app.test_request_context():
+                slow = min(timed(marshmallow_body, size)[1] for _ in range(args.repeat))
+                fast = min(timed(fast_body, size)[1] for _ in range(args.repeat))
+                identical = marshmallow_body(size) == fast_body(size)
+            print(f"{size:>8} rows  encoder={encoder:<7} marshmallow {slow:7.3f}s  fast {fast:7.3f}s  "
+                  f"speedup {slow / fast:5.1f}x  byte-identical={identical}")
+            if encoder == 'json' and not identical:
+                raise SystemExit("fast path output differs from marshmallow")
+
+
+if __name__ == '__main__':
+    main()
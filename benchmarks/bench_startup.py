@@ -0,0 +1,76 @@
+"""Import time and cold start of the app in fresh interpreters.
+
+    python benchmarks/bench_startup.py --runs 10
+
+Each configuration is measured in new processes: the time to import `app`,
+to run `create_app()`, and to serve the first request for the OpenAPI spec
+both without and with the on-disk spec cache. Medians are reported.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CONFIGURATIONS = {
+    'docs + migrations': {},
+    'docs, no migrations': {'MIGRATIONS_ENABLED': 'false'},
+    'no docs, no migrations': {'DOCS_ENABLED': 'false', 'MIGRATIONS_ENABLED': 'false'},
+}
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+import app
+imported = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+spec = None
+if application.config['DOCS_ENABLED']:
+    application.test_client().get('/apispec_1.json')
+    spec = time.perf_counter() - created
+print(json.dumps({{'import': imported - started, 'create_app': created - imported, 'first_spec': spec}}))
+"""
+
+
+def probe(env):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(root=root)],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-startup-')
+    base = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'app.db')}")
+
+    print(f"{'configuration':<26} {'import':>10} {'create_app':>11} {'spec cold':>10} {'spec cached':>12}")
+    for name, overrides in CONFIGURATIONS.items():
+        cache = os.path.join(workdir, f"spec-{len(overrides)}.json")
+        env = dict(base, DOCS_SPEC_CACHE=cache, **overrides)
+        cold, warm = [], []
+        for _ in range(args.runs):
+            if os.path.exists(cache):
+                os.remove(cache)
+            cold.append(probe(env))
+            warm.append(probe(env))
+
+        def median(samples, key):
+            values = [sample[key] for sample in samples if sample[key] is not None]
+            return f"{statistics.median(values) * 1000:.1f}ms" if values else '-'
+
+        print(f"{name:<26} {median(cold + warm, 'import'):>10} {median(cold + warm, 'create_app'):>11} "
+              f"{median(cold, 'first_spec'):>10} {median(warm, 'first_spec'):>12}")
+
+
+if __name__ == '__main__':
+    main()
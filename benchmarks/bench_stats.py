@@ -0,0 +1,66 @@
+"""Show that GET /stats latency does not depend on table size.
+
+    python benchmarks/bench_stats.py --assets 1000000 --violations 10000000
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from common import make_app, seed_assets, seed_events, timed
+
+
+def full_scan_stats():
+    """What a dashboard computes today: scan everything per request"""
+    from sqlalchemy import func, select
+    from app import db
+    from app.models import Asset, Violation
+
+    now = datetime.utcnow()
+    day = func.date(Violation.created_at)
+    db.session.execute(select(day, Violation.event_type, func.count()).group_by(day, Violation.event_type)).all()
+    db.session.execute(select(func.count()).where(Asset.service_time < now)).scalar()
+    db.session.execute(select(func.count()).where(Asset.expiration_time.between(now, now + timedelta(hours=1)))).scalar()
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {p: samples[min(len(samples) - 1, int(len(samples) * p / 100))] * 1000 for p in (50, 95, 99)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--assets', type=int, default=1000000)
+    parser.add_argument('--violations', type=int, default=10000000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed_assets(app, args.assets)
+    seed_events(app, violations=args.violations)
+    with app.app_context():
+        from app.stats import rebuild_violation_counts
+        from app import db
+        rebuild_violation_counts(db.session)
+        db.session.commit()
+        from app.utils import run_checks
+        _, elapsed = timed(run_checks)
+        print(f"run_checks incl. gauge refresh: {elapsed:.3f}s")
+
+    client = app.test_client()
+    samples = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        client.get('/stats')
+        samples.append(time.perf_counter() - start)
+    p = percentiles(samples)
+    print(f"GET /stats      p50 {p[50]:7.2f}ms  p95 {p[95]:7.2f}ms  p99 {p[99]:7.2f}ms  "
+          f"({args.assets} assets, {args.violations} violations)")
+
+    with app.app_context():
+        scans = [timed(full_scan_stats)[1] for _ in range(3)]
+    print(f"full-table scan median {statistics.median(scans) * 1000:9.2f}ms per request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Shared helpers for the benchmark scripts.
+
+Every benchmark runs against a throwaway SQLite database so the numbers are
+comparable between runs and never touch a real deployment.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_app(path=None, reset=True):
+    """Create the application bound to a SQLite file, fresh unless `reset` is False"""
+    if path is None:
+        handle, path = tempfile.mkstemp(suffix='.db', prefix='bench-')
+        os.close(handle)
+    os.environ['DATABASE_URL'] = f"sqlite:///{path}"
+
+    from app import create_app, db
+    from app.config import Config
+    Config.SQLALCHEMY_DATABASE_URI = os.environ['DATABASE_URL']
+
+    app = create_app()
+    if reset:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+    return app
+
+
+def asset_rows(count, now=None, seed=0):
+    """Synthetic assets with a realistic spread of deadlines.
+
+    Roughly 5% are due within the notification window, 20% are overdue and the
+    rest are due some time in the next 90 days.
+    """
+    now = now or datetime.utcnow()
+    rng = random.Random(seed)
+
+    def deadline():
+        roll = rng.random()
+        if roll < 0.05:
+            return now + timedelta(seconds=rng.randint(1, 14 * 60))
+        if roll < 0.25:
+            return now - timedelta(minutes=rng.randint(1, 60 * 24 * 30))
+        return now + timedelta(minutes=rng.randint(16, 60 * 24 * 90))
+
+    rows = []
+    for i in range(count):
+        service_time = deadline()
+        rows.append({
+            'name': f"asset-{i}",
+            'service_time': service_time,
+            'expiration_time': deadline() if rng.random() < 0.7 else None,
+            'last_serviced': service_time - timedelta(days=rng.randint(1, 60)) if rng.random() < 0.8 else None
+        })
+    return rows
+
+
+def seed_assets(app, count, now=None, seed=0, chunk_size=10000):
+    from sqlalchemy import insert
+    from app import db
+    from app.models import Asset
+
+    rows = asset_rows(count, now, seed)
+    with app.app_context():
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(insert(Asset), rows[start:start + chunk_size])
+        db.session.commit()
+
+
+def seed_events(app, notifications=0, violations=0, days=90, seed=1, chunk_size=50000):
+    """Historical notifications and violations spread over the last `days` days.
+
+    They reference asset ids above the seeded range so they never collide with
+    the dedup keys of events created by run_checks.
+    """
+    from sqlalchemy import insert
+    from app import db
+    from app.models import Notification, Violation
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    def created_at():
+        return now - timedelta(minutes=rng.randint(0, days * 24 * 60))
+
+    with app.app_context():
+        for start in range(0, notifications, chunk_size):
+            rows = []
+            for i in range(start, min(start + chunk_size, notifications)):
+                event_time = created_at()
+                rows.append({
+                    'asset_id': 10_000_000 + i // 2,
+                    'event_type': ('service', 'expiration')[i % 2],
+                    'event_time': event_time,
+                    'message': f"Due at {event_time}",
+                    'created_at': event_time - timedelta(minutes=15),
+                    'delivery_status': 'delivered'
+                })
+            db.session.execute(insert(Notification), rows)
+        for start in range(0, violations, chunk_size):
+            rows = []
+            for i in range(start, min(start + chunk_size, violations)):
+                deadline = created_at()
+                rows.append({
+                    'asset_id': 10_000_000 + i // 2,
+                    'event_type': ('service', 'expiration')[i % 2],
+                    'message': "historical violation",
+                    'deadline': deadline,
+                    'created_at': deadline,
+                    'status': 'resolved',
+                    'resolved_at': deadline + timedelta(days=1)
+                })
+            db.session.execute(insert(Violation), rows)
+        db.session.commit()
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -0,0 +1,118 @@
+"""Concurrent readers and writers against one SQLite file, with and without tuning.
+
+    python benchmarks/load_test.py --mode both --readers 8 --writers 4 --seconds 10
+
+'baseline' runs with SQLite's defaults (rollback journal, synchronous=FULL,
+no busy timeout) to reproduce "database is locked" errors; 'tuned' uses the
+WAL / busy_timeout settings from Config.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+BASELINE_ENV = {
+    'SQLITE_JOURNAL_MODE': 'DELETE',
+    'SQLITE_SYNCHRONOUS': 'FULL',
+    'SQLITE_BUSY_TIMEOUT_MS': '0',
+    'SQLITE_MMAP_SIZE': '0',
+}
+
+
+def worker(client, request, stop, counts, lock):
+    ok = errors = 0
+    while not stop.is_set():
+        response = request(client)
+        if succeeded(response):
+            ok += 1
+        else:
+            errors += 1
+    with lock:
+        counts['ok'] += ok
+        counts['errors'] += errors
+
+
+def succeeded(response):
+    """True for a 2xx/3xx response; bulk writes also need every row accepted"""
+    if response.status_code >= 400:
+        return False
+    # /assets/bulk answers 200 and lists rows that failed, e.g. on a lock, in data.errors
+    data = (response.get_json(silent=True) or {}).get('data')
+    return not (isinstance(data, dict) and data.get('errors'))
+
+
+def read(client):
+    return client.get('/assets?limit=50')
+
+
+def make_writer():
+    sequence = iter(range(10 ** 9))
+
+    def write(client):
+        batch = [{'name': f"load-{threading.get_ident()}-{next(sequence)}"} for _ in range(10)]
+        return client.post('/assets/bulk', json=batch)
+    return write
+
+
+def run(args):
+    from common import make_app, seed_assets
+
+    app = make_app()
+    seed_assets(app, args.assets)
+
+    results = {}
+    stop = threading.Event()
+    lock = threading.Lock()
+    threads = []
+    for role, count, request in (('reads', args.readers, read), ('writes', args.writers, make_writer())):
+        results[role] = {'ok': 0, 'errors': 0}
+        for _ in range(count):
+            thread = threading.Thread(target=worker, args=(app.test_client(), request, stop, results[role], lock))
+            threads.append(thread)
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    for counts in results.values():
+        counts['per_second'] = round(counts['ok'] / elapsed, 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=['baseline', 'tuned', 'both'], default='both')
+    parser.add_argument('--assets', type=int, default=10000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    if args.mode != 'both':
+        print(json.dumps(run(args)))
+        return
+
+    # Each mode runs in its own interpreter because the settings are read at import
+    for mode in ('baseline', 'tuned'):
+        env = dict(os.environ, CACHE_BACKEND='none', **(BASELINE_ENV if mode == 'baseline' else {}))
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--assets', str(args.assets), '--readers', str(args.readers),
+             '--writers', str(args.writers), '--seconds', str(args.seconds)],
+            env=env, capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        print(f"{mode:<9} reads {result['reads']['per_second']:>8}/s ({result['reads']['errors']} errors)  "
+              f"writes {result['writes']['per_second']:>7}/s ({result['writes']['errors']} errors)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""Benchmark every endpoint and run_checks on synthetic data, saving results as JSON.
+
+    python benchmarks/suite.py --assets 100000 --notifications 500000 --violations 500000 \\
+        --output results/main.json
+    python benchmarks/suite.py ... --output results/branch.json --compare results/main.json
+
+For each scenario the suite reports p50/p95/p99 latency, throughput, SQL
+statements per call and peak Python memory. The response cache is disabled so
+every call does real work.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ.setdefault('CACHE_BACKEND', 'none')
+
+from common import asset_rows, make_app, seed_assets, seed_events
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.listen(Engine, 'after_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.remove(Engine, 'after_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def scenarios(app, asset_count, calls):
+    """name -> callable(client) performing one operation; each is called at most `calls` times"""
+    rng = random.Random(7)
+    names = itertools.count()
+    created = []
+    doomed = []
+
+    def random_id():
+        return rng.randint(1, asset_count)
+
+    def create(client):
+        response = client.post('/assets', json={'name': f"bench-{next(names)}", 'service_time': _future(rng)})
+        created.append(response.get_json()['data']['id'])
+        return response
+
+    def delete(client):
+        if not created:
+            create(client)
+        return client.delete(f'/assets/{created.pop()}')
+
+    def bulk(client):
+        rows = [{'name': f"bulk-{next(names)}", 'service_time': _future(rng)} for _ in range(100)]
+        return client.post('/assets/bulk', json=rows)
+
+    def bulk_patch(client):
+        first = rng.randint(1, max(asset_count - 99, 1))
+        body = {'ids': list(range(first, first + 100)), 'set': {'last_serviced': _future(rng)}}
+        return client.patch('/assets/bulk', json=body)
+
+    def bulk_delete(client):
+        if not doomed:
+            # Seeded on the first (warmup) call, with enough rows for every call
+            doomed.extend(_seed_doomed(app, 100 * calls))
+        ids = [doomed.pop() for _ in range(min(100, len(doomed)))]
+        return client.delete('/assets/bulk', json={'ids': ids})
+
+    def run_checks_direct(client):
+        from app.utils import run_checks
+        with app.app_context():
+            return run_checks()
+
+    recent = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+    next_week = (datetime.utcnow() + timedelta(days=7)).isoformat()
+    return {
+        'GET /assets': lambda client: client.get('/assets?limit=100'),
+        'GET /assets (filtered)': lambda client: client.get(f'/assets?service_from={recent}&limit=100'),
+        'GET /assets/<id>': lambda client: client.get(f'/assets/{random_id()}'),
+        'GET /assets/due (24h, service)': lambda client: client.get('/assets/due?type=service&limit=100'),
+        'GET /assets/due (7d, hourly counts)': lambda client: client.get(f'/assets/due?bucket=hour&to={next_week}'),
+        'POST /assets': create,
+        'PUT /assets/<id>': lambda client: client.put(f'/assets/{random_id()}', json={'last_serviced': _future(rng)}),
+        'DELETE /assets/<id>': delete,
+        'POST /assets/bulk (100 rows)': bulk,
+        'PATCH /assets/bulk (100 ids)': bulk_patch,
+        'DELETE /assets/bulk (100 ids)': bulk_delete,
+        'GET /notifications': lambda client: client.get('/notifications?limit=100'),
+        'GET /notifications (by asset)': lambda client: client.get(f'/notifications?asset_id={random_id()}'),
+        'GET /notifications/export (since 1h)': lambda client: client.get(f'/notifications/export?since={recent}').get_data(),
+        'GET /violations': lambda client: client.get('/violations?limit=100'),
+        'GET /violations/export (since 1h)': lambda client: client.get(f'/violations/export?since={recent}').get_data(),
+        'GET /stats': lambda client: client.get('/stats'),
+        'POST /run-checks': lambda client: client.post('/run-checks'),
+        'run_checks()': run_checks_direct,
+        'GET /events (from start)': lambda client: client.get('/events?after=0&limit=100&timeout=0'),
+    }
+
+
+def measure(operation, client, iterations, warmup):
+    for _ in range(warmup):
+        operation(client)
+
+    samples = []
+    with QueryCounter() as queries:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            operation(client)
+            samples.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - started
+
+    # Memory is traced on a separate call so tracing does not skew the timings
+    tracemalloc.start()
+    operation(client)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(_percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(_percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(_percentile(samples, 99) * 1000, 3),
+        'ops_per_second': round(iterations / elapsed, 1),
+        'queries_per_op': round(queries.count / iterations, 2),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline):
+    print(f"\n{'scenario':<40} {'p50 ms':>10} {'was':>10} {'change':>8}")
+    for name, result in results['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if not previous:
+            continue
+        change = (result['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100 if previous['p50_ms'] else 0
+        print(f"{name:<40} {result['p50_ms']:>10.3f} {previous['p50_ms']:>10.3f} {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--assets', type=int, default=10000)
+    parser.add_argument('--notifications', type=int, default=50000)
+    parser.add_argument('--violations', type=int, default=50000)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--only', nargs='*', help="run only scenarios whose name contains one of these strings")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="print p50 changes against a previous results file")
+    args = parser.parse_args()
+
+    app = make_app()
+    seed_assets(app, args.assets)
+    seed_events(app, args.notifications, args.violations)
+    client = app.test_client()
+
+    results = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'assets': args.assets,
+            'notifications': args.notifications,
+            'violations': args.violations,
+        },
+        'scenarios': {},
+    }
+    for name, operation in scenarios(app, args.assets, args.iterations + args.warmup + 1).items():
+        if args.only and not any(part in name for part in args.only):
+            continue
+        result = measure(operation, client, args.iterations, args.warmup)
+        results['scenarios'][name] = result
+        print(f"{name:<40} p50 {result['p50_ms']:>9.3f}ms  p95 {result['p95_ms']:>9.3f}ms  "
+              f"p99 {result['p99_ms']:>9.3f}ms  {result['ops_per_second']:>8.1f} ops/s  "
+              f"{result['queries_per_op']:>6.2f} q/op  {result['peak_memory_kb']:>9.1f} KiB")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+    if args.compare:
+        with open(args.compare) as handle:
+            compare(results, json.load(handle))
+
+
+def _seed_doomed(app, count):
+    """Insert `count` throwaway assets for the bulk delete scenario and return their ids"""
+    from sqlalchemy import insert, select
+    from app import db
+    from app.models import Asset
+
+    rows = [dict(row, name=f"doomed-{i}") for i, row in enumerate(asset_rows(count, seed=3))]
+    with app.app_context():
+        db.session.execute(insert(Asset), rows)
+        db.session.commit()
+        return db.session.execute(select(Asset.id).where(Asset.name.like('doomed-%'))).scalars().all()
+
+
+def _future(rng):
+    return (datetime.utcnow() + timedelta(minutes=rng.randint(1, 60 * 24 * 30))).isoformat()
+
+
+def _percentile(samples, percent):
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+import os
+import tempfile
+import pytest
+
+# Config is read at import time; give the suite a throwaway SQLite file
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+
+from app import create_app, db
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        db.session.remove()
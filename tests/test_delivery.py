@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.delivery import DeliveryWorker, StubSink
+from app.models import Asset, Notification
+
+
+def add_notifications(count):
+    asset = Asset(name='pump')
+    db.session.add(asset)
+    db.session.flush()
+    now = datetime.utcnow()
+    db.session.add_all(
+        Notification(asset_id=asset.id, message=f"due {i}", event_type='service', event_time=now + timedelta(minutes=i))
+        for i in range(count)
+    )
+    db.session.commit()
+
+
+def outbox():
+    db.session.expire_all()
+    return db.session.execute(db.select(Notification).order_by(Notification.id)).scalars().all()
+
+
+def test_delivers_every_pending_notification(app):
+    add_notifications(25)
+    sink = StubSink()
+    stats = DeliveryWorker(sink, batch_size=10, concurrency=2).drain()
+
+    assert stats["delivered"] == 25
+    assert sorted(row['message'] for row in sink.delivered) == sorted(f"due {i}" for i in range(25))
+    assert all(row.delivery_status == 'delivered' and row.delivered_at for row in outbox())
+
+
+def test_failed_batch_is_retried_with_backoff(app):
+    add_notifications(3)
+    worker = DeliveryWorker(StubSink(fail_batches=1), batch_size=10, backoff_seconds=30)
+    before = datetime.utcnow()
+    stats = worker.drain()
+
+    assert stats["retried"] == 3 and stats["delivered"] == 0
+    for row in outbox():
+        assert row.delivery_status == 'pending'
+        assert row.delivery_attempts == 1
+        assert row.next_attempt_at >= before + timedelta(seconds=30)
+
+    # Not due yet: nothing is sent until the backoff has passed
+    assert worker.drain()["delivered"] == 0
+    db.session.execute(db.update(Notification).values(next_attempt_at=datetime.utcnow()))
+    db.session.commit()
+    assert worker.drain()["delivered"] == 3
+    assert all(row.delivery_status == 'delivered' for row in outbox())
+
+
+def test_backoff_doubles_per_attempt(app):
+    add_notifications(1)
+    worker = DeliveryWorker(StubSink(fail_batches=2), backoff_seconds=10, max_attempts=5)
+    worker.drain()
+    db.session.execute(db.update(Notification).values(next_attempt_at=datetime.utcnow()))
+    db.session.commit()
+    before = datetime.utcnow()
+    worker.drain()
+
+    row, = outbox()
+    assert row.delivery_attempts == 2
+    assert before + timedelta(seconds=20) <= row.next_attempt_at <= datetime.utcnow() + timedelta(seconds=20)
+
+
+def test_marks_failed_after_max_attempts(app):
+    add_notifications(2)
+    worker = DeliveryWorker(StubSink(fail_batches=2), max_attempts=2, backoff_seconds=0)
+    worker.drain()
+    stats = worker.drain()
+
+    assert stats["failed"] == 2
+    assert [row.delivery_status for row in outbox()] == ['failed', 'failed']
+    assert all(row.next_attempt_at is None for row in outbox())
+    assert worker.drain()["delivered"] == 0
+
+
+def test_claimed_rows_are_not_sent_twice(app):
+    add_notifications(5)
+    first = DeliveryWorker(StubSink(), lease_seconds=60)
+    claimed = first._claim(0, datetime.utcnow())
+
+    assert len(claimed) == 5
+    assert DeliveryWorker(StubSink()).drain()["delivered"] == 0
+    # Once the lease expires another worker takes them over
+    later = DeliveryWorker(StubSink())
+    assert len(later._claim(0, datetime.utcnow() + timedelta(seconds=61))) == 5
+
+
+def test_recording_failure_does_not_stop_the_drain(app, monkeypatch):
+    add_notifications(25)
+    worker = DeliveryWorker(StubSink(), batch_size=5, concurrency=1, queue_size=1)
+    calls = []
+
+    def record_success(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise OperationalError("UPDATE", {}, Exception("database is locked"))
+        return original(batch)
+
+    original = worker._record_success
+    monkeypatch.setattr(worker, '_record_success', record_success)
+    stats = worker.drain()
+
+    assert len(calls) == 5
+    assert stats["delivered"] == 20
+    # The unrecorded batch stays claimed until its lease expires
+    assert [row.delivery_status for row in outbox()].count('sending') == 5